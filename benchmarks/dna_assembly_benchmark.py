@@ -0,0 +1,116 @@
+"""Benchmark of schedule_processes_series on the DNA assembly workload.
+
+The DNA assembly process of ``examples/examples_data/dna_assembly.xls`` is
+scheduled for 5, 10, 20 and 40 work units, with and without the daily breaks
+of ``examples/dna_assembly_example.py``. The results (time of each step,
+makespan, total lateness) are appended to a history file and compared to a
+baseline. The script exits with status 1 if any result is worse than the
+baseline by more than the tolerances.
+
+Usage:
+
+    python dna_assembly_benchmark.py
+    python dna_assembly_benchmark.py --units 5 10 --time-tolerance 1.0
+    python dna_assembly_benchmark.py --update-baseline
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from taskpacker import (ProcessTemplate, resources_from_spreadsheet, Task,
+                        __version__)
+from taskpacker.benchmarks import (run_series_benchmark, compare_to_baseline,
+                                   append_to_history)
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+SPREADSHEET_PATH = os.path.join(THIS_DIR, "..", "examples", "examples_data",
+                                "dna_assembly.xls")
+
+
+def load_processes(n_units):
+    resources = resources_from_spreadsheet(spreadsheet_path=SPREADSHEET_PATH,
+                                           sheetname="resources")
+    template = ProcessTemplate.from_spreadsheet(
+        spreadsheet_path=SPREADSHEET_PATH, sheetname="process",
+        resources_dict=resources)
+    return template.instantiate_many(n_units, "WU%d_"), resources
+
+
+def make_breaks(resources, n_days):
+    """Same breaks as in dna_assembly_example.py, for n_days days."""
+    return [
+        Task("break_%03d" % i,
+             resources=[resources["igor"]],
+             scheduled_resources={resources["igor"]: 1},
+             duration=12 * 60, scheduled_start=24 * 60 * i,
+             color='white')
+        for i in range(n_days)
+    ]
+
+
+def run_benchmarks(units, time_limit):
+    results = {}
+    for n_units in units:
+        for breaks in (False, True):
+            name = "dna_assembly_%02d_units%s" % (
+                n_units, "_with_breaks" if breaks else "")
+            print("Running %s..." % name)
+            processes, resources = load_processes(n_units)
+            scheduled_breaks = make_breaks(resources, n_days=n_units) \
+                if breaks else []
+            results[name] = run_series_benchmark(
+                processes, scheduled_tasks=scheduled_breaks,
+                est_process_duration=5000, time_limit=time_limit)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--units", type=int, nargs="+",
+                        default=[5, 10, 20, 40])
+    parser.add_argument("--time-limit", type=int, default=5,
+                        help="time limit of each solver run, in seconds")
+    parser.add_argument("--history",
+                        default=os.path.join(THIS_DIR, "history.jsonl"))
+    parser.add_argument("--baseline",
+                        default=os.path.join(THIS_DIR, "baseline.json"))
+    parser.add_argument("--time-tolerance", type=float, default=0.5)
+    parser.add_argument("--makespan-tolerance", type=float, default=0.0)
+    parser.add_argument("--lateness-tolerance", type=float, default=0.0)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.units, args.time_limit)
+    append_to_history(args.history, results,
+                      date=datetime.datetime.now().isoformat(),
+                      version=__version__, time_limit=args.time_limit)
+    for name, result in sorted(results.items()):
+        print("%s: %.1fs, makespan %s, total lateness %s" % (
+            name, result["total_time"], result["makespan"],
+            result["total_lateness"]))
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print("Baseline written in %s" % args.baseline)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline found, run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, tolerances=dict(
+        total_time=args.time_tolerance,
+        makespan=args.makespan_tolerance,
+        total_lateness=args.lateness_tolerance))
+    for regression in regressions:
+        print("REGRESSION - " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
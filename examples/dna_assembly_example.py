@@ -1,4 +1,4 @@
-from taskpacker import (tasks_from_spreadsheet,
+from taskpacker import (ProcessTemplate,
                         resources_from_spreadsheet,
                         schedule_processes_series,
                         plot_tasks_dependency_graph,
@@ -18,14 +18,11 @@ spreadsheet_path = os.path.join("examples_data", "dna_assembly.xls")
 resources = resources_from_spreadsheet(spreadsheet_path=spreadsheet_path,
                                        sheetname="resources")
 
-processes = [
-    tasks_from_spreadsheet(spreadsheet_path=spreadsheet_path,
-                           sheetname="process",
-                           resources_dict=resources,
-                           tasks_color=next(colors),
-                           task_name_prefix="WU%d_" % (i + 1))
-    for i in range(20)
-]
+process_template = ProcessTemplate.from_spreadsheet(
+    spreadsheet_path=spreadsheet_path, sheetname="process",
+    resources_dict=resources)
+processes = process_template.instantiate_many(20, "WU%d_",
+                                              tasks_colors=colors)
 
 
 # CREATE THE BREAKS
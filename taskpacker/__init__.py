@@ -4,7 +4,19 @@
 
 from .taskpacker import (Task, Resource, numberjack_scheduler,
                          schedule_processes_series)
+from .greedy import greedy_scheduler
+from .parallel import portfolio_scheduler
+from .anytime import improving_schedules
+from .report import SolveReport, NoSolutionError
+from .profiling import (SchedulerObserver, PhaseTimer,
+                        MemoryPeakObserver)
+from .tasktable import TaskTable
+from .validation import validate_schedule, Violation
+from .metrics import schedule_metrics
+from .template import ProcessTemplate
+from .cache import SpreadsheetCache
 from .io import (plot_schedule, tasks_from_spreadsheet,
                  tasks_to_spreadsheet, resources_from_spreadsheet,
-                 plot_tasks_dependency_graph)
+                 plot_tasks_dependency_graph, iter_tasks_from_csv,
+                 save_schedule, load_schedule)
 from .version import __version__
@@ -0,0 +1,79 @@
+"""Iterating over the schedules found by the solver, as they are found."""
+
+import threading
+from queue import Queue
+
+from .taskpacker import numberjack_scheduler
+
+
+def improving_schedules(tasks, **scheduler_kwargs):
+    """Yield the improving schedules of the tasks as soon as they are found.
+
+    ``numberjack_scheduler`` is run in a background thread, with an
+    ``on_solution`` function passing each schedule found to this generator.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks to be scheduled. Once the iteration is complete, the
+      tasks hold the last schedule found, as with ``numberjack_scheduler``.
+
+    scheduler_kwargs
+      Parameters of ``numberjack_scheduler``, e.g. ``time_limit=60`` or
+      ``warm_start=True`` (to get a first schedule almost immediately).
+
+    Yields
+    ------
+
+    (schedule, cost, elapsed_time)
+      See the ``on_solution`` parameter of ``numberjack_scheduler``.
+
+    The schedules yielded are copies, which the scheduler doesn't modify
+    afterwards. Stopping the iteration early (e.g. with ``break``) stops the
+    search when the next schedule is found or at the time limit, and waits
+    for the scheduler to return, so that the tasks are then no longer
+    modified. Errors of the scheduler (e.g. a ValueError if no schedule is
+    found) are raised at the end of the iteration.
+
+    Examples
+    --------
+
+    >>> for schedule, cost, elapsed_time in improving_schedules(tasks):
+    >>>     print ("Cost %d after %.02fs" % (cost, elapsed_time))
+    >>>     if elapsed_time > 10:
+    >>>         break
+    """
+    done = object()
+    solutions = Queue()
+    stop = threading.Event()
+    errors = []
+
+    def on_solution(schedule, cost, elapsed_time):
+        schedule = {task: (start, None if slots is None else dict(slots))
+                    for task, (start, slots) in schedule.items()}
+        solutions.put((schedule, cost, elapsed_time))
+        return stop.is_set()
+
+    def run_scheduler():
+        try:
+            numberjack_scheduler(tasks, on_solution=on_solution,
+                                 **scheduler_kwargs)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            solutions.put(done)
+
+    thread = threading.Thread(target=run_scheduler, daemon=True)
+    thread.start()
+    try:
+        while True:
+            solution = solutions.get()
+            if solution is done:
+                break
+            yield solution
+    finally:
+        stop.set()
+        thread.join()
+    if errors:
+        raise errors[0]
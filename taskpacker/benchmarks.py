@@ -0,0 +1,351 @@
+"""Synthetic scheduling problems and scaling benchmarks of the schedulers."""
+
+import json
+import random
+import time
+import tracemalloc
+
+from .taskpacker import (Task, Resource, numberjack_scheduler,
+                         schedule_processes_series)
+from .report import NoSolutionError
+from .profiling import PhaseTimer
+
+try:
+    import matplotlib.pyplot as plt
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+
+
+def generate_instance(n_units=5, tasks_per_unit=10, n_resources=5,
+                      capacities=(1, 1, 2, 4), durations=(5, 60),
+                      resources_per_task=(1, 2), precedence_density=0.3,
+                      max_wait_tightness=0.0, due_date_pressure=0.0,
+                      identical_units=True, seed=0):
+    """Generate a random scheduling problem made of work units.
+
+    The problem is entirely determined by the parameters (including the
+    seed), so that the same instance can be generated on different
+    machines.
+
+    Parameters
+    ----------
+
+    n_units
+      Number of work units (processes).
+
+    tasks_per_unit
+      Number of tasks in each work unit.
+
+    n_resources
+      Number of resources, shared by all work units.
+
+    capacities
+      Capacities among which the capacity of each resource is picked.
+
+    durations
+      Range ``(min, max)`` of the tasks durations.
+
+    resources_per_task
+      Range ``(min, max)`` of the number of resources used by a task.
+
+    precedence_density
+      Probability that a task follows a given earlier task of its unit. The
+      tasks of a unit are also always chained so that each task (but the
+      first) follows at least one earlier task.
+
+    max_wait_tightness
+      Between 0 and 1. Each task following a single other task gets a
+      ``max_wait`` with this probability, equal to
+      ``(1 - max_wait_tightness)`` times twice the average task duration (so
+      1 means "start right away").
+
+    due_date_pressure
+      If 0, tasks have no due time. Otherwise the last task of the n-th unit
+      is due at ``n * L / due_date_pressure``, where L is the length of the
+      longest chain of tasks in a unit (so pressures above 1 make units
+      overlap to meet their due times).
+
+    identical_units
+      If True, all units are copies of the same random unit (as when the
+      same process is read several times from a spreadsheet), else each
+      unit is generated separately.
+
+    seed
+      Seed of the random number generator.
+
+    Returns
+    -------
+
+    (processes, resources)
+      A list of processes (each a list of tasks) and the list of resources.
+
+    """
+    rng = random.Random(seed)
+    resources = [Resource("R%02d" % i, capacity=rng.choice(capacities))
+                 for i in range(n_resources)]
+    mean_duration = 0.5 * (durations[0] + durations[1])
+    max_wait = int(round(2 * mean_duration * (1 - max_wait_tightness)))
+
+    def generate_unit_template():
+        template = []
+        for i in range(tasks_per_unit):
+            parents = [j for j in range(i)
+                       if rng.random() < precedence_density]
+            if (i > 0) and (parents == []):
+                parents = [rng.randrange(i)]
+            n_task_resources = min(n_resources,
+                                   rng.randint(*resources_per_task))
+            template.append(dict(
+                duration=rng.randint(*durations),
+                resources=rng.sample(resources, n_task_resources),
+                parents=parents,
+                # A max_wait after several parents is often infeasible.
+                max_wait=max_wait if (
+                    (len(parents) == 1) and
+                    (rng.random() < max_wait_tightness)) else None
+            ))
+        return template
+
+    def critical_path(template):
+        ends = []
+        for task in template:
+            ends.append(task["duration"] + max([0] + [
+                ends[parent] for parent in task["parents"]]))
+        return max(ends)
+
+    template = generate_unit_template()
+    processes = []
+    for unit in range(n_units):
+        if not identical_units and (unit > 0):
+            template = generate_unit_template()
+        due_time = None
+        if due_date_pressure > 0:
+            due_time = int((unit + 1) * critical_path(template) /
+                           due_date_pressure)
+        process = []
+        for i, task in enumerate(template):
+            process.append(Task(
+                "WU%d_T%d" % (unit + 1, i + 1),
+                resources=list(task["resources"]),
+                duration=task["duration"],
+                follows=[process[parent] for parent in task["parents"]],
+                max_wait=task["max_wait"],
+                due_time=due_time if (i == len(template) - 1) else None
+            ))
+        processes.append(process)
+    return processes, resources
+
+
+def run_scaling_benchmark(sizes=(2, 4, 8, 16), configurations=None,
+                          measure_memory=True, **instance_parameters):
+    """Run schedulers on generated problems of increasing sizes.
+
+    Parameters
+    ----------
+
+    sizes
+      Numbers of work units of the generated problems.
+
+    configurations
+      Dict ``{name: parameters}`` of ``numberjack_scheduler`` parameters to
+      compare, e.g. ``{"greedy": dict(solver_method="greedy")}``. Defaults
+      to a greedy and a Mistral configuration.
+
+    measure_memory
+      If True the peak memory allocated by Python during each run is
+      measured with ``tracemalloc`` (which slows down the runs).
+
+    instance_parameters
+      Parameters of ``generate_instance`` (e.g. ``tasks_per_unit``,
+      ``seed``).
+
+    Returns
+    -------
+
+    results
+      A list of dicts (one per run) with keys ``configuration``, ``n_units``,
+      ``n_tasks``, ``build_time``, ``solve_time``, ``total_time``, ``cost``,
+      ``gap``, ``status`` and ``peak_memory`` (in bytes, or None). The
+      status is "failed" for runs which raised a ValueError.
+
+    """
+    if configurations is None:
+        configurations = {
+            "greedy": dict(solver_method="greedy"),
+            "mistral": dict(solver_method="Mistral", upper_bound="auto",
+                            warm_start=True, time_limit=5),
+        }
+    results = []
+    for n_units in sizes:
+        for name, parameters in configurations.items():
+            processes, resources = generate_instance(n_units=n_units,
+                                                     **instance_parameters)
+            tasks = [task for process in processes for task in process]
+            stats = {}
+            if measure_memory:
+                tracemalloc.start()
+            start_time = time.time()
+            try:
+                numberjack_scheduler(tasks, stats=stats, **parameters)
+            except NoSolutionError:
+                stats.setdefault("status", "infeasible")
+            except ValueError:
+                # E.g. the greedy scheduler failing on max_wait constraints.
+                stats["status"] = "failed"
+            total_time = time.time() - start_time
+            peak_memory = None
+            if measure_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results.append(dict(
+                configuration=name,
+                n_units=n_units,
+                n_tasks=len(tasks),
+                build_time=stats.get("model_build_time"),
+                solve_time=stats.get("solve_time"),
+                total_time=total_time,
+                cost=stats.get("cost"),
+                gap=stats.get("gap"),
+                status=stats.get("status"),
+                peak_memory=peak_memory
+            ))
+    return results
+
+
+def plot_scaling_curves(results, y="total_time", ax=None, logscale=True):
+    """Plot a quantity against the number of tasks, for each configuration.
+
+    Parameters
+    ----------
+
+    results
+      Results of ``run_scaling_benchmark``.
+
+    y
+      The result field to plot, e.g. "total_time", "build_time", "cost" or
+      "peak_memory".
+
+    ax
+      A Matplotlib ax. If None, a new one is created.
+
+    logscale
+      If True, both axes use a logarithmic scale.
+
+    """
+    if not MATPLOTLIB_AVAILABLE:
+        raise ImportError("Install Matplotlib to plot the scaling curves.")
+    if ax is None:
+        fig, ax = plt.subplots(1, figsize=(6, 4))
+    configurations = []
+    for result in results:
+        if result["configuration"] not in configurations:
+            configurations.append(result["configuration"])
+    for configuration in configurations:
+        points = sorted(
+            (result["n_tasks"], result[y]) for result in results
+            if (result["configuration"] == configuration) and
+            (result[y] is not None)
+        )
+        if points:
+            xx, yy = zip(*points)
+            ax.plot(xx, yy, marker="o", label=configuration)
+    if logscale:
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+    ax.set_xlabel("number of tasks")
+    ax.set_ylabel(y)
+    ax.legend()
+    return ax
+
+
+def run_series_benchmark(processes, scheduled_tasks=(), **series_parameters):
+    """Schedule processes with ``schedule_processes_series`` and measure it.
+
+    Parameters
+    ----------
+
+    processes
+      A list of processes (each a list of tasks).
+
+    scheduled_tasks
+      Pre-scheduled tasks (e.g. breaks), see ``schedule_processes_series``.
+
+    series_parameters
+      Other parameters of ``schedule_processes_series``.
+
+    Returns
+    -------
+
+    result
+      A dict with keys ``n_units``, ``step_times`` (time in seconds of each
+      step of the series), ``total_time``, ``makespan`` (end of the last
+      task) and ``total_lateness`` (sum of the delays of the tasks past their
+      due times).
+
+    """
+    timer = PhaseTimer()
+    start_time = time.time()
+    new_processes = schedule_processes_series(
+        processes, scheduled_tasks=scheduled_tasks, observer=timer,
+        **series_parameters)
+    total_time = time.time() - start_time
+    tasks = [task for process in new_processes for task in process]
+    return dict(
+        n_units=len(processes),
+        step_times=timer.runs["series_step"],
+        total_time=total_time,
+        makespan=max(task.scheduled_end for task in tasks),
+        total_lateness=sum(
+            max(0, task.scheduled_end - task.due_time)
+            for task in tasks
+            if task.due_time is not None
+        )
+    )
+
+
+def compare_to_baseline(results, baseline, tolerances=None):
+    """Return the regressions of benchmark results compared to a baseline.
+
+    Parameters
+    ----------
+
+    results, baseline
+      Dicts ``{benchmark_name: result}`` where each result is a dict of
+      numbers (e.g. as returned by ``run_series_benchmark``).
+
+    tolerances
+      Dict ``{field: tolerance}`` of the fields to compare. A result is a
+      regression if its value is more than ``(1 + tolerance)`` times the
+      baseline value. Defaults to 50% for ``total_time`` and 0 for
+      ``makespan`` and ``total_lateness``.
+
+    Returns
+    -------
+
+    regressions
+      A list of strings describing the regressions (empty if none).
+      Benchmarks absent from the baseline are ignored.
+
+    """
+    if tolerances is None:
+        tolerances = dict(total_time=0.5, makespan=0, total_lateness=0)
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        for field, tolerance in sorted(tolerances.items()):
+            value, reference = result[field], baseline[name][field]
+            if value > (1 + tolerance) * reference:
+                regressions.append(
+                    "%s: %s is %s, baseline %s (tolerance %d%%)" %
+                    (name, field, value, reference, 100 * tolerance))
+    return regressions
+
+
+def append_to_history(history_path, results, **metadata):
+    """Append benchmark results to a history file (one JSON record per
+    line) with metadata such as the date or version."""
+    with open(history_path, "a") as f:
+        f.write(json.dumps(dict(metadata, results=results),
+                           sort_keys=True) + "\n")
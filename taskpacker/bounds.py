@@ -0,0 +1,196 @@
+"""Bounds on the start times of tasks, computed from the tasks dependencies.
+
+These bounds are used to restrict the domain of each task in the solver
+instead of giving all tasks the same ``[lower_bound, upper_bound]`` domain.
+"""
+
+
+def topological_sort(tasks):
+    """Return the tasks sorted so that each task comes after the tasks it
+    follows (only the dependencies between the given tasks are considered).
+    """
+    tasks_set = set(tasks)
+    children = {task: [] for task in tasks}
+    n_parents = {task: 0 for task in tasks}
+    for task in tasks:
+        for parent in task.follows:
+            if parent in tasks_set:
+                children[parent].append(task)
+                n_parents[task] += 1
+    stack = [task for task in tasks if n_parents[task] == 0][::-1]
+    result = []
+    while stack:
+        task = stack.pop()
+        result.append(task)
+        for child in children[task]:
+            n_parents[child] -= 1
+            if n_parents[child] == 0:
+                stack.append(child)
+    if len(result) < len(tasks):
+        raise ValueError("The tasks dependencies contain a cycle.")
+    return result
+
+
+def earliest_starts(tasks, lower_bound=None):
+    """Return a dict {task: earliest possible start} (the "heads").
+
+    A task cannot start before ``lower_bound`` (if the task is not
+    scheduled yet), or before the tasks it follows are completed. Scheduled
+    tasks start at their ``scheduled_start``. A task followed by another task
+    with a ``max_wait`` cannot end more than ``max_wait`` before the earliest
+    start of this other task.
+    """
+    lower_bound = 0 if lower_bound is None else lower_bound
+    sorted_tasks = topological_sort(tasks)
+    heads = {}
+    for task in sorted_tasks:
+        if task.scheduled_start is not None:
+            heads[task] = task.scheduled_start
+            continue
+        heads[task] = max([lower_bound] + [
+            heads[parent] + parent.duration
+            if parent in heads else parent.scheduled_end
+            for parent in task.follows
+            if (parent in heads) or (parent.scheduled_end is not None)
+        ])
+    for task in sorted_tasks[::-1]:
+        if task.max_wait is None:
+            continue
+        for parent in task.follows:
+            if (parent in heads) and (parent.scheduled_start is None):
+                heads[parent] = max(heads[parent], heads[task] -
+                                    task.max_wait - parent.duration)
+    return heads
+
+
+def latest_starts(tasks, horizon):
+    """Return a dict {task: latest possible start} (horizon minus "tails").
+
+    A task must be completed by the horizon, and early enough for all the
+    tasks following it to be completed by the horizon. Scheduled tasks start
+    at their ``scheduled_start``. A task with a ``max_wait`` cannot start
+    later than ``max_wait`` after the latest end of the tasks it follows.
+    """
+    sorted_tasks = topological_sort(tasks)
+    children = {task: [] for task in tasks}
+    for task in tasks:
+        for parent in task.follows:
+            if parent in children:
+                children[parent].append(task)
+    latest = {}
+    for task in sorted_tasks[::-1]:
+        if task.scheduled_start is not None:
+            latest[task] = task.scheduled_start
+            continue
+        latest[task] = min([horizon] + [
+            latest[child] for child in children[task]
+        ]) - task.duration
+    for task in sorted_tasks:
+        if (task.max_wait is None) or (task.scheduled_start is not None):
+            continue
+        for parent in task.follows:
+            if parent in latest:
+                latest[task] = min(latest[task], latest[parent] +
+                                   parent.duration + task.max_wait)
+    return latest
+
+
+def sum_of_starts_bound(tasks, heads):
+    """Return a lower bound on the sum of the start times of the tasks.
+
+    Each task starts at the earliest at its head. Moreover, the unscheduled
+    tasks sharing a resource of capacity ``c`` cannot all start at the
+    earliest head of these tasks: at best they start as in a shortest
+    processing time (SPT) schedule on ``c`` parallel machines. This bound is
+    used for the largest improvements over the heads given by resources
+    which share no tasks.
+    """
+    resources_tasks = {}
+    for task in tasks:
+        if task.scheduled_start is not None:
+            continue
+        for resource in task.resources:
+            if resource.capacity != 'inf':
+                resources_tasks.setdefault(resource, []).append(task)
+    improvements = []
+    for resource, resource_tasks in resources_tasks.items():
+        durations = sorted(task.duration for task in resource_tasks)
+        n_tasks = len(durations)
+        earliest = min(heads[task] for task in resource_tasks)
+        spt_starts = n_tasks * earliest + sum(
+            duration * ((n_tasks - 1 - i) // resource.capacity)
+            for i, duration in enumerate(durations)
+        )
+        improvement = spt_starts - sum(heads[task] for task in resource_tasks)
+        if improvement > 0:
+            improvements.append((improvement, resource_tasks))
+    bound = sum(heads.values())
+    counted_tasks = set()
+    for improvement, resource_tasks in sorted(improvements, reverse=True,
+                                              key=lambda item: item[0]):
+        if counted_tasks.isdisjoint(resource_tasks):
+            bound += improvement
+            counted_tasks.update(resource_tasks)
+    return bound
+
+
+def lower_bounds(tasks, lower_bound=None):
+    """Return cheap lower bounds for any schedule of the tasks.
+
+    The bounds are returned as a dict with the following keys:
+
+    - ``critical_path``: end of the longest chain of dependent tasks.
+    - ``resource_energy``: for the most loaded resource, earliest start of
+      its tasks plus the sum of their durations divided by its capacity.
+    - ``makespan``: the largest of the two bounds above.
+    - ``weighted_lateness``: sum of ``priority * delay`` for tasks which
+      would be late even if started at their earliest start.
+    - ``cost``: lower bound for the cost minimized by ``numberjack_scheduler``
+      (see ``schedule_cost``), accounting for the contention of the tasks on
+      the resources (see ``sum_of_starts_bound``).
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks.
+
+    lower_bound
+      Time before which no unscheduled task can start.
+
+    """
+    heads = earliest_starts(tasks, lower_bound=lower_bound)
+    critical_path = max([heads[task] + task.duration for task in tasks] + [0])
+    resources_tasks = {}
+    for task in tasks:
+        for resource in task.resources:
+            resources_tasks.setdefault(resource, []).append(task)
+    resource_energy = max([0] + [
+        min(heads[task] for task in resource_tasks) +
+        -(-sum(task.duration for task in resource_tasks) //
+          resource.capacity)
+        for resource, resource_tasks in resources_tasks.items()
+        if resource.capacity != 'inf'
+    ])
+    lateness = {
+        task: task.priority * max(0, heads[task] + task.duration -
+                                  task.due_time)
+        for task in tasks
+        if task.due_time is not None
+    }
+    return dict(
+        critical_path=critical_path,
+        resource_energy=resource_energy,
+        makespan=max(critical_path, resource_energy),
+        weighted_lateness=sum(lateness.values()),
+        cost=sum_of_starts_bound(tasks, heads) +
+        1000 * sum(lateness.values())
+    )
+
+
+def optimality_gap(cost, cost_lower_bound):
+    """Return the relative gap (between 0 and 1) between the cost of a
+    schedule and a lower bound of the cost."""
+    if cost <= 0:
+        return 0.0
+    return max(0.0, 1.0 * (cost - cost_lower_bound) / cost)
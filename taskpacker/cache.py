@@ -0,0 +1,154 @@
+"""On-disk cache of the tables read from spreadsheets.
+
+Parsing Excel files is slow. A ``SpreadsheetCache`` stores the tables read
+from the spreadsheets as pickled pandas dataframes, keyed by the content of
+the file (and the sheet read), so that loading the same file again doesn't
+involve the Excel parser. The cache directory has a maximal size, the least
+recently used tables being deleted first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas
+
+
+class SpreadsheetCache:
+    """Cache of spreadsheet tables in a directory.
+
+    Parameters
+    ----------
+
+    directory
+      Directory of the cache (created if needed).
+
+    max_size
+      Maximal total size in bytes of the cached tables. When it is exceeded,
+      the least recently used tables are deleted.
+
+    Examples
+    --------
+
+    >>> cache = SpreadsheetCache("~/.taskpacker_cache")
+    >>> tasks = tasks_from_spreadsheet("process.xls", cache=cache)
+
+    """
+
+    index_filename = "index.json"
+
+    def __init__(self, directory, max_size=100 * 1024 ** 2):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def _load_index(self):
+        index_path = os.path.join(self.directory, self.index_filename)
+        if not os.path.exists(index_path):
+            return {}
+        try:
+            with open(index_path, "r") as f:
+                return json.load(f)
+        except ValueError:
+            return {}
+
+    def _temporary_file(self):
+        """Return ``(file_descriptor, path)`` of a new unique temporary file
+        in the cache directory, to be renamed once written."""
+        return tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+
+    def _save_index(self, index):
+        index_path = os.path.join(self.directory, self.index_filename)
+        file_descriptor, temporary_path = self._temporary_file()
+        try:
+            with os.fdopen(file_descriptor, "w") as f:
+                json.dump(index, f)
+            os.replace(temporary_path, index_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def content_hash(self, path):
+        """Return the SHA-256 of the file's content.
+
+        The hash is only recomputed if the file's modification time or size
+        changed since it was last computed."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        index = self._load_index()
+        mtime, size, file_hash = index.get(path, (None, None, None))
+        if (mtime, size) != (stat.st_mtime, stat.st_size):
+            sha256 = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 ** 2), b""):
+                    sha256.update(block)
+            file_hash = sha256.hexdigest()
+            index[path] = (stat.st_mtime, stat.st_size, file_hash)
+            self._save_index(index)
+        return file_hash
+
+    def table_path(self, spreadsheet_path, sheetname=None, sep=","):
+        """Return the path of the cached table for a file and sheet."""
+        # The sheet name only matters for Excel files, the separator for CSV.
+        if spreadsheet_path.endswith("csv"):
+            sheetname = None
+        else:
+            sep = None
+        key = json.dumps([self.content_hash(spreadsheet_path),
+                          sheetname, sep])
+        filename = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pkl"
+        return os.path.join(self.directory, filename)
+
+    def read_table(self, spreadsheet_path, sheetname=None, sep=","):
+        """Return the table of the spreadsheet, from the cache if possible
+        (see ``io.read_table``)."""
+        from .io import read_table
+        table_path = self.table_path(spreadsheet_path, sheetname, sep)
+        if os.path.exists(table_path):
+            try:
+                # Mark the table as recently used.
+                os.utime(table_path, None)
+                return pandas.read_pickle(table_path)
+            except Exception:
+                # Corrupted, truncated or unreadable (e.g. written by another
+                # pandas version) table, or evicted meanwhile: parse again.
+                try:
+                    os.remove(table_path)
+                except OSError:
+                    pass
+        table = read_table(spreadsheet_path, sheetname=sheetname, sep=sep)
+        file_descriptor, temporary_path = self._temporary_file()
+        os.close(file_descriptor)
+        try:
+            table.to_pickle(temporary_path)
+            os.replace(temporary_path, table_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        self.evict()
+        return table
+
+    def evict(self):
+        """Delete the least recently used tables until the total size of the
+        cache is under ``max_size``."""
+        tables = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.directory, filename))
+                tables.append((stat.st_mtime, stat.st_size, filename))
+        total_size = sum(size for (mtime, size, filename) in tables)
+        for mtime, size, filename in sorted(tables):
+            if total_size <= self.max_size:
+                break
+            os.remove(os.path.join(self.directory, filename))
+            total_size -= size
+
+    def clear(self):
+        """Delete all the cached tables, the index and the temporary files
+        left by interrupted writes."""
+        for filename in os.listdir(self.directory):
+            if filename.endswith((".pkl", ".tmp")) or (filename ==
+                                                       self.index_filename):
+                os.remove(os.path.join(self.directory, filename))
@@ -0,0 +1,388 @@
+"""Fast list-scheduling of tasks, without any constraint solver.
+
+The tasks are placed one after the other (in an order respecting the
+``follows`` dependencies and favoring urgent tasks), each at the earliest time
+where all its resources have a free slot. When a task cannot start within the
+``max_wait`` of its parent tasks, the tasks occupying its resources at that
+time are first placed again after it, and if this is not enough the parents
+are delayed and placed again (together with the tasks depending on them).
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from .report import NoSolutionError
+
+
+class SlotTimeline:
+    """Sorted list of the (non-overlapping) time intervals booked in a slot."""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def earliest_fit(self, time, duration):
+        """Return the earliest start >= time of a free interval of the given
+        duration."""
+        start = time
+        for i in range(bisect_right(self.ends, time), len(self.starts)):
+            if self.starts[i] >= start + duration:
+                break
+            start = max(start, self.ends[i])
+        return start
+
+    def add(self, start, end):
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+
+    def remove(self, start, end):
+        index = bisect_left(self.starts, start)
+        while self.ends[index] != end:
+            index += 1
+        del self.starts[index]
+        del self.ends[index]
+
+
+def greedy_schedule(tasks, lower_bound=None, max_restarts=None):
+    """Compute a feasible schedule of the tasks by list scheduling.
+
+    The tasks are not modified. Tasks with a ``scheduled_start`` are
+    considered fixed (and keep their ``scheduled_resources`` if any). The
+    other tasks keep the slots already set in their ``scheduled_resources``.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks to be scheduled.
+
+    lower_bound
+      Time before which no unscheduled task can start (default 0).
+
+    max_restarts
+      Maximal number of times the parents of a task with a ``max_wait`` can
+      be delayed. Defaults to 100 times the number of tasks.
+
+    Returns
+    -------
+
+    schedule
+      A dict ``{task: (start, {resource: slot})}`` for all tasks.
+
+    """
+    lower_bound = 0 if lower_bound is None else lower_bound
+    if max_restarts is None:
+        max_restarts = 100 * len(tasks)
+    tasks_set = set(tasks)
+    timelines = {}
+
+    def resource_timelines(resource):
+        if resource not in timelines:
+            timelines[resource] = [SlotTimeline()
+                                   for i in range(resource.capacity)]
+        return timelines[resource]
+
+    # Tasks placed on each resource (with a finite capacity).
+    placed_tasks = defaultdict(set)
+
+    def book(task, start, slots, undo=False):
+        for resource, slot in slots.items():
+            if resource.capacity == 'inf':
+                continue
+            timeline = resource_timelines(resource)[slot - 1]
+            if undo:
+                timeline.remove(start, start + task.duration)
+                placed_tasks[resource].discard(task)
+            else:
+                timeline.add(start, start + task.duration)
+                placed_tasks[resource].add(task)
+
+    schedule = {}
+    fixed_tasks = [t for t in tasks if t.scheduled_start is not None]
+    free_tasks = [t for t in tasks if t.scheduled_start is None]
+
+    # PLACE THE FIXED TASKS
+
+    for task in fixed_tasks:
+        start, end = task.scheduled_start, task.scheduled_end
+        slots = dict(task.scheduled_resources or {})
+        for resource in task.resources:
+            if resource in slots:
+                continue
+            if resource.capacity == 'inf':
+                slots[resource] = 1
+                continue
+            for slot, timeline in enumerate(resource_timelines(resource)):
+                if timeline.earliest_fit(start, task.duration) == start:
+                    slots[resource] = slot + 1
+                    break
+            else:
+                raise NoSolutionError("Fixed task %s has no free slot of %s"
+                                      % (task.name, resource.name))
+        book(task, start, slots)
+        schedule[task] = (start, slots)
+
+    # ORDER THE FREE TASKS (URGENT AND CRITICAL TASKS FIRST)
+
+    children = {task: [] for task in free_tasks}
+    n_free_parents = {task: 0 for task in free_tasks}
+    release = {task: lower_bound for task in free_tasks}
+    deadline = {task: None for task in free_tasks}
+    for task in tasks:
+        for parent in task.follows:
+            if parent not in tasks_set:
+                if (task in release) and (parent.scheduled_end is not None):
+                    release[task] = max(release[task], parent.scheduled_end)
+            elif parent in children:
+                if task in children:
+                    children[parent].append(task)
+                    n_free_parents[task] += 1
+                else:
+                    # The parent must end before its fixed child starts, and
+                    # not more than max_wait before.
+                    latest = task.scheduled_start - parent.duration
+                    if deadline[parent] is not None:
+                        latest = min(latest, deadline[parent])
+                    deadline[parent] = latest
+                    if task.max_wait is not None:
+                        release[parent] = max(
+                            release[parent],
+                            latest - task.max_wait)
+
+    tail = {}
+    due = {}
+    topological_order = []
+    stack = [t for t in free_tasks if n_free_parents[t] == 0]
+    remaining_parents = dict(n_free_parents)
+    while stack:
+        task = stack.pop()
+        topological_order.append(task)
+        for child in children[task]:
+            remaining_parents[child] -= 1
+            if remaining_parents[child] == 0:
+                stack.append(child)
+    if len(topological_order) < len(free_tasks):
+        raise ValueError("The tasks dependencies contain a cycle.")
+    for task in topological_order[::-1]:
+        tail[task] = max([0] + [child.duration + tail[child]
+                                for child in children[task]])
+        due[task] = min(
+            [float('inf') if task.due_time is None else task.due_time] +
+            [due[child] - child.duration for child in children[task]]
+        )
+
+    index = {task: i for i, task in enumerate(free_tasks)}
+
+    def priority_key(task):
+        # Among tasks released by the same parents, those which must start
+        # soon after (max_wait) and end soon are placed first.
+        wait_deadline = (float('inf') if task.max_wait is None
+                         else task.max_wait + task.duration)
+        return (due[task], wait_deadline, -task.priority, -tail[task],
+                index[task], task)
+
+    order = []
+    heap = [priority_key(t) for t in free_tasks if n_free_parents[t] == 0]
+    heapq.heapify(heap)
+    remaining_parents = dict(n_free_parents)
+    while heap:
+        task = heapq.heappop(heap)[-1]
+        order.append(task)
+        for child in children[task]:
+            remaining_parents[child] -= 1
+            if remaining_parents[child] == 0:
+                heapq.heappush(heap, priority_key(child))
+    position = {task: i for i, task in enumerate(order)}
+
+    # PLACE THE FREE TASKS ONE BY ONE
+
+    def end_time(task):
+        start, slots = schedule[task]
+        return start + task.duration
+
+    def earliest_placement(task, time):
+        while True:
+            slots = {}
+            next_time = time
+            for resource in task.resources:
+                preset_slot = (task.scheduled_resources or {}).get(resource)
+                if resource.capacity == 'inf':
+                    slots[resource] = preset_slot or 1
+                    continue
+                timelines = resource_timelines(resource)
+                if preset_slot is None:
+                    candidates = enumerate(timelines)
+                else:
+                    candidates = [(preset_slot - 1,
+                                   timelines[preset_slot - 1])]
+                fit, slot = min(
+                    (timeline.earliest_fit(time, task.duration), i + 1)
+                    for i, timeline in candidates
+                )
+                slots[resource] = slot
+                next_time = max(next_time, fit)
+            if next_time == time:
+                return time, slots
+            time = next_time
+
+    # The pending tasks are placed by increasing rank (their position in the
+    # order, or -1 for a task which must be placed before the others).
+    rank = dict(position)
+
+    def push(task):
+        heapq.heappush(pending, (rank[task], position[task]))
+
+    def unplace(tasks_to_unplace):
+        """Remove the tasks and their placed descendants from the schedule
+        (they will be placed again)."""
+        to_unplace = list(tasks_to_unplace)
+        while to_unplace:
+            unplaced_task = to_unplace.pop()
+            if unplaced_task in schedule:
+                book(unplaced_task, *schedule.pop(unplaced_task), undo=True)
+                push(unplaced_task)
+                to_unplace.extend(children[unplaced_task])
+
+    def find_late_parents(task, parents, start):
+        if task.max_wait is None:
+            return []
+        return [parent for parent in parents
+                if start > end_time(parent) + task.max_wait]
+
+    # Parents' starts when each task was last promoted before its blockers.
+    promotions = {}
+
+    def promote(task, earliest, latest_end):
+        """Unplace the movable tasks using the resources of the task between
+        ``earliest`` and ``latest_end``, so that the task can be placed before
+        them. Return False if there are none, or if the task was already
+        promoted with its parents at the same place."""
+        parents_starts = tuple(schedule[parent][0]
+                               for parent in task.follows
+                               if parent in schedule)
+        if promotions.get(task) == parents_starts:
+            return False
+        promotions[task] = parents_starts
+        blockers = set(
+            other_task
+            for resource in task.resources
+            if resource.capacity != 'inf'
+            for other_task in placed_tasks[resource]
+            if (other_task in position) and (other_task is not task) and
+            (schedule[other_task][0] < latest_end) and
+            (end_time(other_task) > earliest)
+        )
+        unplace(blockers)
+        return len(blockers) > 0
+
+    n_late = defaultdict(int)
+    pending = [(i, i) for i in range(len(order))]
+    n_restarts = 0
+    while pending:
+        task_rank, i = heapq.heappop(pending)
+        task = order[i]
+        rank[task] = i
+        parents = [p for p in task.follows if p in schedule]
+        earliest = max([release[task]] + [end_time(p) for p in parents])
+        start, slots = earliest_placement(task, earliest)
+        late_parents = find_late_parents(task, parents, start)
+        promoting = False
+        if late_parents:
+            n_late[task] += 1
+            latest_start = min(end_time(parent) + task.max_wait
+                               for parent in late_parents)
+            # Delaying the parents is usually enough and cheaper. Tasks which
+            # remain late, or whose parents are fixed, are moved before the
+            # tasks blocking them.
+            promoting = (n_late[task] > 2) or any(
+                parent not in position for parent in late_parents)
+        if promoting:
+            # Place the task before the tasks using its resources when it
+            # should start (e.g. its siblings).
+            if promote(task, earliest, latest_start + task.duration):
+                n_restarts += 1
+                start, slots = earliest_placement(task, earliest)
+                late_parents = find_late_parents(task, parents, start)
+        if late_parents and promoting:
+            # If other parents end too late, delaying the late parents won't
+            # help: place these parents before the tasks using their
+            # resources, then place the task again.
+            promoted_parents = []
+            for parent in [p for p in parents if (p in position) and
+                           (end_time(p) > latest_start)]:
+                if (parent in schedule) and promote(parent, max(
+                        [release[parent]] +
+                        [end_time(grandparent)
+                         for grandparent in parent.follows
+                         if grandparent in schedule]), latest_start):
+                    promoted_parents.append(parent)
+            if promoted_parents:
+                n_restarts += 1
+                for parent in promoted_parents:
+                    rank[parent] = -1
+                unplace(promoted_parents)
+                push(task)
+                continue
+        if late_parents:
+            # Delay the parents so that the task starts within max_wait. The
+            # parents and all their placed descendants are placed again.
+            n_restarts += 1
+            if n_restarts > max_restarts:
+                raise NoSolutionError("Could not respect the max_wait of "
+                                      "task %s" % task.name)
+            for parent in late_parents:
+                if parent not in position:
+                    raise NoSolutionError(
+                        "Task %s cannot start within max_wait of fixed task "
+                        "%s" % (task.name, parent.name))
+                release[parent] = max(release[parent], start - task.max_wait -
+                                      parent.duration)
+            unplace(late_parents)
+            push(task)
+            continue
+        if (deadline[task] is not None) and (start > deadline[task]):
+            raise NoSolutionError("Task %s cannot end before its fixed "
+                                  "children start." % task.name)
+        book(task, start, slots)
+        schedule[task] = (start, slots)
+
+    return schedule
+
+
+def greedy_scheduler(tasks, upper_bound=None, lower_bound=None):
+    """Schedule the tasks by list scheduling, without constraint solver.
+
+    This is much faster than ``numberjack_scheduler`` and returns a schedule
+    respecting all constraints (resources capacities, dependencies, max_wait,
+    pre-scheduled tasks) but which is generally not optimal. Urgent tasks
+    (with an early ``due_time``, or followed by tasks with an early due time)
+    are placed first.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks to be scheduled. The tasks are modified in place (their
+      ``scheduled_start`` and ``scheduled_resources`` are set).
+
+    upper_bound
+      Time at which all tasks should be completed. A ValueError is raised if
+      the schedule found ends later.
+
+    lower_bound
+      Time before which no unscheduled task can start.
+
+    """
+    schedule = greedy_schedule(tasks, lower_bound=lower_bound)
+    if upper_bound is not None:
+        if any((start + task.duration) > upper_bound
+               for task, (start, slots) in schedule.items()):
+            raise NoSolutionError("No solution found by the greedy "
+                                  "scheduler before the upper bound %s"
+                                  % upper_bound)
+    for task, (start, slots) in schedule.items():
+        task.scheduled_start = start
+        task.scheduled_resources = slots
+    return tasks
@@ -1,8 +1,13 @@
 from taskpacker import Task, Resource
 import itertools as itt
+import json
+import os
 import pandas
 import numpy as np
 
+from .cache import SpreadsheetCache
+from .tasktable import TaskTable
+
 try:
     import matplotlib.pyplot as plt
     import matplotlib.patches as patches
@@ -17,58 +22,167 @@ try:
 except ImportError:
     NX_AVAILABLE = False
 
-def tasks_from_spreadsheet(spreadsheet_path, resources_dict=None,
-                           sheetname='tasks', resources_sheetname='resources',
-                           tasks_color="blue",
-                           task_name_prefix="", sep=";"):
-    if resources_dict is None:
-        resources_dict = resources_from_spreadsheet(
-            spreadsheet_path, sheetname=resources_sheetname)
-
+def read_table(spreadsheet_path, sheetname=None, sep=",", cache=None):
+    """Read a CSV file or a sheet of an Excel file into a pandas dataframe.
 
+    ``cache`` is an optional ``cache.SpreadsheetCache`` (or the path of its
+    directory) from which the table is read if it was already parsed."""
+    if cache is not None:
+        if not isinstance(cache, SpreadsheetCache):
+            cache = SpreadsheetCache(cache)
+        return cache.read_table(spreadsheet_path, sheetname=sheetname,
+                                sep=sep)
     if spreadsheet_path.endswith("csv"):
-        process_df = pandas.read_csv(spreadsheet_path, sep=sep)
-    else:
-        process_df = pandas.read_excel(spreadsheet_path,
-                                       sheetname=sheetname)
-    process_tasks = {}
-    tasks_list = []
-    for i, row in process_df.iterrows():
-        task_resources = [
-            resources_dict[r.strip()]
-            for r in row.resources.split(",")
-        ]
-        follows = str(row.follows)
-        if follows == "nan":
-            follows = ()
-        else:
-            follows = [process_tasks[t.strip()] for t in follows.split(",")]
+        return pandas.read_csv(spreadsheet_path, sep=sep)
+    return pandas.read_excel(spreadsheet_path, sheet_name=sheetname)
+
+
+def _column(dataframe, column):
+    """Return the values of a column as a list, with None for NaN values
+    (or for all rows if the column is missing)."""
+    if column not in dataframe.columns:
+        return [None] * len(dataframe)
+    values = dataframe[column]
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _split_column(dataframe, column):
+    """Return a list of lists of the stripped comma-separated elements of the
+    cells of a column (None for empty cells)."""
+    if column not in dataframe.columns:
+        return [None] * len(dataframe)
+    values = dataframe[column]
+    splits = values.astype(str).str.split(",")
+    return [
+        None if missing else [element.strip() for element in elements]
+        for missing, elements in zip(values.isna().tolist(), splits.tolist())
+    ]
 
-        if str(row.scheduled_resources) == "nan":
-            scheduled_resources = None
-        else:
-            scheduled_resources = {
+
+def tasks_from_dataframe(process_df, resources_dict, tasks_color="blue",
+                         task_name_prefix="", process_tasks=None):
+    """Create tasks from a dataframe with one row per task.
+
+    The columns are parsed in bulk (see ``tasks_from_spreadsheet`` for the
+    format). Tasks can follow tasks defined in any row, or in the
+    ``process_tasks`` dict.
+
+    Parameters
+    ----------
+
+    process_df
+      A pandas dataframe.
+
+    resources_dict
+      A dict {resource_name: Resource}.
+
+    tasks_color, task_name_prefix
+      See ``tasks_from_spreadsheet``.
+
+    process_tasks
+      Optional dict {task_name_in_the_dataframe: task} of tasks which can be
+      followed by the new tasks. The new tasks are added to it.
+
+    """
+    if process_tasks is None:
+        process_tasks = {}
+    names = process_df["task"].tolist()
+    durations = process_df["duration"].tolist()
+    resources = _split_column(process_df, "resources")
+    follows = _split_column(process_df, "follows")
+    scheduled_resources = _split_column(process_df, "scheduled_resources")
+    colors = _column(process_df, "color")
+    max_waits = _column(process_df, "max_wait")
+    scheduled_starts = _column(process_df, "scheduled_start")
+
+    tasks_list = []
+    for i, name in enumerate(names):
+        new_task = Task(
+            name=task_name_prefix + name,
+            resources=[resources_dict[r] for r in resources[i]],
+            duration=durations[i],
+            color=tasks_color if colors[i] is None else colors[i],
+            max_wait=None if max_waits[i] is None else int(max_waits[i]),
+            scheduled_start=(None if scheduled_starts[i] is None
+                             else int(scheduled_starts[i])),
+            scheduled_resources=None if scheduled_resources[i] is None else {
                 resources_dict[r.split(":")[0].strip()]: int(r.split(":")[1])
-                for r in row.scheduled_resources.split(",")
+                for r in scheduled_resources[i]
             }
-        new_task = Task(
-            name=task_name_prefix + row.task,
-            resources=task_resources,
-            duration=row.duration,
-            follows=follows,
-            color=(tasks_color if (str(row.color) == "nan")
-                               else row.color),
-            max_wait=(None if (str(row.max_wait) == "nan")
-                           else int(row.max_wait)),
-            scheduled_start=(None if (str(row.scheduled_start) == "nan")
-                                  else int(row.scheduled_start)),
-            scheduled_resources=scheduled_resources
         )
-        process_tasks[row.task] = new_task
+        process_tasks[name] = new_task
         tasks_list.append(new_task)
-
+    for task, task_follows in zip(tasks_list, follows):
+        if task_follows is not None:
+            task.follows = [process_tasks[t] for t in task_follows]
     return tasks_list
 
+
+def tasks_from_spreadsheet(spreadsheet_path, resources_dict=None,
+                           sheetname='tasks', resources_sheetname='resources',
+                           tasks_color="blue",
+                           task_name_prefix="", sep=";", cache=None):
+    """Read a list of tasks from an Excel or CSV file.
+
+    The file has one row per task and columns ``task`` (name), ``resources``
+    (comma-separated resources names), ``duration``, and optionally
+    ``follows`` (comma-separated tasks names), ``max_wait``, ``color``,
+    ``scheduled_start`` and ``scheduled_resources`` (comma-separated
+    ``resource_name:slot``).
+
+    Parameters
+    ----------
+
+    spreadsheet_path
+      Path to a ``.csv`` file or an Excel file.
+
+    resources_dict
+      A dict {resource_name: Resource}. If None, the resources are read from
+      the ``resources_sheetname`` sheet of the file.
+
+    sheetname
+      Name of the Excel sheet with the tasks.
+
+    tasks_color
+      Color of the tasks with no color in the spreadsheet.
+
+    task_name_prefix
+      Prefix added to the names of all tasks (e.g. "WU1_").
+
+    sep
+      Separator of the columns of a CSV file.
+
+    cache
+      Optional ``cache.SpreadsheetCache`` (or path of its directory) used to
+      skip the parsing of files already read.
+
+    """
+    if resources_dict is None:
+        resources_dict = resources_from_spreadsheet(
+            spreadsheet_path, sheetname=resources_sheetname, cache=cache)
+    process_df = read_table(spreadsheet_path, sheetname=sheetname, sep=sep,
+                            cache=cache)
+    return tasks_from_dataframe(process_df, resources_dict,
+                                tasks_color=tasks_color,
+                                task_name_prefix=task_name_prefix)
+
+
+def iter_tasks_from_csv(csv_path, resources_dict, chunksize=10000,
+                        tasks_color="blue", task_name_prefix="", sep=";"):
+    """Yield the tasks of a (large) CSV file, reading it by chunks of rows.
+
+    Same parameters and format as ``tasks_from_spreadsheet``, except that a
+    task can only follow tasks defined earlier in the file (or in the same
+    chunk of ``chunksize`` rows).
+    """
+    process_tasks = {}
+    for chunk in pandas.read_csv(csv_path, sep=sep, chunksize=chunksize):
+        for task in tasks_from_dataframe(chunk, resources_dict,
+                                         tasks_color=tasks_color,
+                                         task_name_prefix=task_name_prefix,
+                                         process_tasks=process_tasks):
+            yield task
+
 def tasks_to_spreadsheet(tasks, filepath):
     import pandas
     df_tasks = pandas.DataFrame.from_records([
@@ -85,20 +199,127 @@ def tasks_to_spreadsheet(tasks, filepath):
         df_tasks.to_excel(writer, sheet_name='tasks', index=False)
         df_resources.to_excel(writer, sheet_name='resources', index=False)
 
-def resources_from_spreadsheet(spreadsheet_path, sheetname='resources'):
-    if spreadsheet_path.endswith("csv"):
-        resources_df = pandas.read_csv(spreadsheet_path)
+
+SCHEDULE_ARRAYS = ["names", "durations", "starts", "due_times", "max_waits",
+                   "priorities", "resource_indptr", "resource_indices",
+                   "slots", "has_slots", "follows_indptr", "follows_indices"]
+
+
+def save_schedule(tasks, directory):
+    """Save tasks and their schedule in a directory of NumPy files.
+
+    The columns of the tasks' ``TaskTable`` (times, resources and slots,
+    dependencies) are saved as ``.npy`` files, which ``load_schedule`` can
+    memory-map, and the resources and colors in a ``metadata.json`` file.
+    Tasks followed by the given tasks are also saved.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks, or a ``TaskTable``.
+
+    directory
+      Path of the directory to create (or overwrite the files of).
+
+    """
+    if isinstance(tasks, TaskTable):
+        table, n_tasks = tasks, len(tasks)
     else:
-        resources_df = pandas.read_excel(spreadsheet_path, sheetname)
+        tasks = list(tasks)
+        table = TaskTable.from_tasks(tasks, include_parents=True)
+        n_tasks = len(tasks)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    for name in SCHEDULE_ARRAYS:
+        array = getattr(table, name)
+        if name == "names":
+            array = np.array([str(task_name) for task_name in array],
+                             dtype=str)
+        np.save(os.path.join(directory, name + ".npy"), array)
+    metadata = dict(
+        n_tasks=n_tasks,
+        integer_times=table.integer_times,
+        resources=[[resource.name, resource.full_name,
+                    resource.capacity if resource.capacity == 'inf'
+                    else int(resource.capacity)]
+                   for resource in table.resources],
+        colors=[list(color) if isinstance(color, tuple) else color
+                for color in table.colors]
+    )
+    with open(os.path.join(directory, "metadata.json"), "w") as f:
+        json.dump(metadata, f)
+
+
+def load_schedule(directory, mmap_mode="r", as_table=False):
+    """Load tasks saved with ``save_schedule``.
+
+    Parameters
+    ----------
+
+    directory
+      Path of the directory written by ``save_schedule``.
+
+    mmap_mode
+      Memory-map mode of the arrays (see ``numpy.load``). With the default
+      "r" the arrays are only read from the disk when accessed. Use None to
+      read them in memory.
+
+    as_table
+      If True, a ``TaskTable`` (whose arrays are memory-mapped) is returned
+      instead of a list of tasks. This is much faster for large schedules.
+
+    Returns
+    -------
+
+    tasks
+      The list of the saved tasks (with the same schedule), or a TaskTable
+      of these tasks and the tasks they follow.
+
+    """
+    with open(os.path.join(directory, "metadata.json"), "r") as f:
+        metadata = json.load(f)
+    arrays = {
+        name: np.load(os.path.join(directory, name + ".npy"),
+                      mmap_mode=mmap_mode)
+        for name in SCHEDULE_ARRAYS
+    }
+    colors = [tuple(color) if isinstance(color, list) else color
+              for color in metadata["colors"]]
+    table = TaskTable(
+        colors=np.array(colors + [None], dtype=object)[:-1],
+        resources=[Resource(name, full_name=full_name, capacity=capacity)
+                   for name, full_name, capacity in metadata["resources"]],
+        # (a dict {column: bool}, or a single boolean for all the columns)
+        integer_times=metadata["integer_times"],
+        **arrays
+    )
+    if as_table:
+        return table
+    return table.to_tasks()[:metadata["n_tasks"]]
+
+def resources_from_dataframe(resources_df):
+    """Return a dict {resource_name: Resource} from a dataframe with columns
+    ``resource_name``, ``full_name`` and ``capacity``."""
     return {
-        row.resource_name: Resource(
-            name=row.resource_name,
-            full_name=row.full_name,
-            capacity='inf' if str(row.capacity) == "inf" else int(row.capacity)
+        name: Resource(
+            name=name,
+            full_name=full_name,
+            capacity='inf' if str(capacity) == "inf" else int(capacity)
         )
-        for i, row in resources_df.iterrows()
+        for name, full_name, capacity in zip(
+            resources_df["resource_name"].tolist(),
+            resources_df["full_name"].tolist(),
+            resources_df["capacity"].tolist())
     }
 
+
+def resources_from_spreadsheet(spreadsheet_path, sheetname='resources',
+                               cache=None):
+    return resources_from_dataframe(read_table(spreadsheet_path,
+                                               sheetname=sheetname,
+                                               cache=cache))
+
 def plot_schedule(tasks, legend=False, ax=None, edgewidth=1.0):
     """ Plot the work units schedule in a gant-like way.
 
@@ -0,0 +1,156 @@
+"""Metrics of a schedule: makespan, lateness, resources usage, idle gaps.
+
+The metrics are computed with NumPy over a ``TaskTable`` and returned as
+numbers and pandas dataframes. The schedule is assumed to be valid (see
+``validation.validate_schedule``); unscheduled tasks are ignored.
+"""
+
+import numpy as np
+import pandas
+
+from .tasktable import TaskTable
+
+
+def schedule_metrics(tasks):
+    """Compute the main metrics of a schedule.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks or a ``TaskTable``. Tasks followed by the listed tasks
+      are also considered.
+
+    Returns
+    -------
+
+    metrics
+      A dict with the following entries:
+
+      - ``start``, ``makespan``: start of the first task and end of the last
+        task. Utilizations are computed over this period.
+      - ``total_weighted_lateness``: sum over the tasks of their priority
+        times their delay past their due time.
+      - ``lateness``: array of the delays of the tasks past their due times
+        (0 for tasks without due time), in the order of the table.
+      - ``resources``: dataframe indexed by resource name, with columns
+        ``capacity``, ``n_tasks``, ``busy_time`` (sum of the durations of the
+        tasks) and ``utilization`` (busy time over capacity times the
+        scheduling period, NaN for resources with an 'inf' capacity).
+      - ``slots``: dataframe with one row per used resource slot, with
+        columns ``resource``, ``slot``, ``n_tasks``, ``busy_time``,
+        ``occupancy`` (fraction of the scheduling period), ``idle_time``
+        (time between the first and last task not used) and
+        ``max_idle_gap``.
+      - ``waits``: dataframe with one row per dependency, with columns
+        ``task``, ``follows`` and ``wait`` (time between the end of the
+        ``follows`` task and the start of the task).
+      - ``idle_gaps``: dataframe with columns ``resource``, ``slot``,
+        ``start``, ``end``, ``duration``, one row per period during which a
+        slot is unused between two tasks.
+
+    """
+    if isinstance(tasks, TaskTable):
+        table = tasks
+    else:
+        table = TaskTable.from_tasks(tasks, include_parents=True)
+    names = table.names
+    starts, ends = table.starts, table.ends
+    scheduled = ~np.isnan(starts)
+    if not scheduled.any():
+        raise ValueError("No scheduled tasks.")
+    start, makespan = starts[scheduled].min(), ends[scheduled].max()
+    period = makespan - start
+
+    # LATENESS
+
+    with np.errstate(invalid="ignore"):
+        lateness = np.maximum(0, ends - table.due_times)
+    lateness[np.isnan(lateness)] = 0
+
+    # RESOURCES
+
+    entry_tasks = table.tasks_indices
+    entry_resources = table.resource_indices
+    entry_slots = table.slots
+    considered = scheduled[entry_tasks]
+    entry_tasks = entry_tasks[considered]
+    entry_resources = entry_resources[considered]
+    entry_slots = entry_slots[considered]
+    durations = table.durations[entry_tasks]
+
+    n_resources = len(table.resources)
+    capacities = np.array([np.nan if resource.capacity == 'inf'
+                           else resource.capacity
+                           for resource in table.resources], dtype=float)
+    busy_time = np.bincount(entry_resources, weights=durations,
+                            minlength=n_resources)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilization = busy_time / (capacities * period)
+    resources = pandas.DataFrame(
+        dict(capacity=[resource.capacity for resource in table.resources],
+             n_tasks=np.bincount(entry_resources, minlength=n_resources),
+             busy_time=busy_time, utilization=utilization),
+        index=pandas.Index([resource.name for resource in table.resources],
+                           name="resource"))
+
+    # SLOTS AND IDLE GAPS
+
+    with_slot = entry_slots > 0
+    order = np.lexsort((starts[entry_tasks[with_slot]],
+                        entry_slots[with_slot], entry_resources[with_slot]))
+    slot_tasks = entry_tasks[with_slot][order]
+    slot_resources = entry_resources[with_slot][order]
+    slot_slots = entry_slots[with_slot][order]
+    new_group = np.ones(len(slot_tasks), dtype=bool)
+    new_group[1:] = ((slot_resources[1:] != slot_resources[:-1]) |
+                     (slot_slots[1:] != slot_slots[:-1]))
+    group = np.cumsum(new_group) - 1
+    gap_positions = np.flatnonzero(
+        ~new_group[1:] &
+        (starts[slot_tasks[1:]] > ends[slot_tasks[:-1]])) + 1
+    gap_starts = ends[slot_tasks[gap_positions - 1]]
+    gap_ends = starts[slot_tasks[gap_positions]]
+    resource_names = np.array([resource.name
+                               for resource in table.resources], dtype=object)
+    idle_gaps = pandas.DataFrame(dict(
+        resource=resource_names[slot_resources[gap_positions]],
+        slot=slot_slots[gap_positions],
+        start=gap_starts, end=gap_ends, duration=gap_ends - gap_starts))
+
+    n_groups = int(new_group.sum())
+    group_first = np.flatnonzero(new_group)
+    slots_busy_time = np.bincount(group, weights=table.durations[slot_tasks],
+                                  minlength=n_groups)
+    slots_idle_time = np.bincount(group[gap_positions],
+                                  weights=gap_ends - gap_starts,
+                                  minlength=n_groups)
+    max_idle_gap = np.zeros(n_groups)
+    np.maximum.at(max_idle_gap, group[gap_positions], gap_ends - gap_starts)
+    slots = pandas.DataFrame(dict(
+        resource=resource_names[slot_resources[group_first]],
+        slot=slot_slots[group_first],
+        n_tasks=np.bincount(group, minlength=n_groups),
+        busy_time=slots_busy_time,
+        occupancy=slots_busy_time / period if period else np.nan,
+        idle_time=slots_idle_time,
+        max_idle_gap=max_idle_gap))
+
+    # WAITS BETWEEN DEPENDENT TASKS
+
+    children = np.repeat(np.arange(len(table)), np.diff(table.follows_indptr))
+    parents = table.follows_indices
+    waits = pandas.DataFrame(dict(
+        task=names[children], follows=names[parents],
+        wait=starts[children] - ends[parents]))
+
+    return dict(
+        start=float(start),
+        makespan=float(makespan),
+        total_weighted_lateness=float((table.priorities * lateness).sum()),
+        lateness=lateness,
+        resources=resources,
+        slots=slots,
+        waits=waits,
+        idle_gaps=idle_gaps
+    )
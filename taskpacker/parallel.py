@@ -0,0 +1,241 @@
+"""Running several scheduler configurations in parallel processes.
+
+The tasks are pickled and sent to worker processes, which send back the
+schedules as (task index, start, slots) records so that the results can be
+written in the caller's own Task objects.
+"""
+
+import os
+import queue
+import time
+from multiprocessing import Pool
+
+from .taskpacker import numberjack_scheduler, schedule_cost
+from .report import NoSolutionError
+
+DEFAULT_PORTFOLIO = [
+    dict(solver_method="greedy"),
+    dict(solver_method="Mistral"),
+    dict(solver_method="Mistral", warm_start=True),
+    dict(solver_method="Mistral", capacity_model="cumulative"),
+    dict(solver_method="Mistral", randomization=True, random_seed=1,
+         heuristic=("DomainOverWDegree", "Random")),
+    dict(solver_method="Mistral", randomization=True, random_seed=2,
+         heuristic=("DomainOverWDegree", "Random")),
+    dict(solver_method="Mistral", heuristic=("Impact", "Lex")),
+]
+
+
+def solve_in_worker(tasks, scheduler_kwargs):
+    """Schedule the tasks with ``numberjack_scheduler`` (meant to be run in a
+    worker process).
+
+    Returns ``(records, error, stats)``. ``records`` is None if no schedule
+    was found, else a list of records
+    ``(task_index, start, [(resource_index, slot), ...])`` where the indices
+    refer to positions in ``tasks`` and in the tasks' ``resources``.
+    ``error`` describes the exception raised by the scheduler, if it failed
+    for another reason than finding no solution. ``stats`` is the dict of
+    statistics filled by the scheduler.
+    """
+    stats = {}
+    try:
+        scheduled_tasks = numberjack_scheduler(tasks, stats=stats,
+                                               **scheduler_kwargs)
+    except NoSolutionError:
+        return None, None, stats
+    except Exception as error:
+        return None, "%s: %s" % (type(error).__name__, error), stats
+    tasks_indices = {task: i for i, task in enumerate(tasks)}
+    records = [
+        (tasks_indices[task], task.scheduled_start, [
+            (task.resources.index(resource), slot)
+            for resource, slot in task.scheduled_resources.items()
+            if resource in task.resources
+        ])
+        for task in scheduled_tasks
+    ]
+    return records, None, stats
+
+
+def records_to_schedule(tasks, records):
+    """Convert records from ``solve_in_worker`` into a dict
+    ``{task: (start, {resource: slot})}`` using the caller's tasks."""
+    return {
+        tasks[task_index]: (start, {
+            tasks[task_index].resources[resource_index]: slot
+            for (resource_index, slot) in slots
+        })
+        for (task_index, start, slots) in records
+    }
+
+
+def apply_schedule(schedule):
+    """Write a schedule ``{task: (start, {resource: slot})}`` in the tasks
+    and return the list of scheduled tasks."""
+    for task, (start, slots) in schedule.items():
+        task.scheduled_start = start
+        task.scheduled_resources = slots
+    return list(schedule.keys())
+
+
+def portfolio_scheduler(tasks, configurations=None, time_limit=5,
+                        n_jobs=None, grace_period=2, stats=None,
+                        first_success_patience=None, **scheduler_kwargs):
+    """Run several scheduler configurations in parallel, keep the best.
+
+    Each configuration runs ``numberjack_scheduler`` in its own process, with
+    the same time limit. Once this time limit (plus a grace period for model
+    building and loading) has elapsed, the best schedule found (the one with
+    the lowest ``schedule_cost``) is written in the tasks.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks to be scheduled. The tasks are modified in place.
+
+    configurations
+      List of dicts of ``numberjack_scheduler`` parameters, e.g.
+      ``dict(solver_method="Mistral", randomization=True, random_seed=2)``.
+      Defaults to ``DEFAULT_PORTFOLIO``, which pairs a greedy baseline with
+      several solver settings, seeds and heuristics.
+
+    time_limit
+      Time limit in seconds of each solver, and of the whole portfolio
+      (not counting the grace period). Configurations can set their own
+      ``time_limit``, in which case the longest one limits the portfolio.
+
+    n_jobs
+      Number of worker processes. Defaults to the number of configurations
+      or of CPUs, whichever is lower.
+
+    grace_period
+      Extra time in seconds given to the workers after the time limit.
+
+    first_success_patience
+      If provided, the portfolio stops this many seconds after the first
+      configuration finding a schedule has returned, instead of waiting for
+      all configurations. Use 0 to accept the first schedule found.
+
+    stats
+      Optional dict which will be filled with the cost obtained by each
+      configuration (``costs``, None for configurations which found no
+      schedule or did not finish), the ``errors`` raised by the
+      configurations which failed (None for the others) and the
+      ``best_configuration``.
+
+    scheduler_kwargs
+      Parameters common to all configurations (e.g. ``upper_bound``).
+
+    """
+    if configurations is None:
+        configurations = DEFAULT_PORTFOLIO
+    if n_jobs is None:
+        n_jobs = min(len(configurations), os.cpu_count() or 1)
+    tasks = list(tasks)
+    start_time = time.time()
+    results = [(None, None, None)] * len(configurations)
+    # The workers' results are collected by the pool's callbacks.
+    finished = queue.Queue()
+
+    def callbacks(i):
+        def on_result(result):
+            finished.put((i, result))
+
+        def on_error(error):
+            finished.put((i, (None, "%s: %s" % (type(error).__name__,
+                                                error), None)))
+        return on_result, on_error
+
+    pool = Pool(n_jobs)
+    for i, configuration in enumerate(configurations):
+        on_result, on_error = callbacks(i)
+        # The configuration's own parameters (e.g. its time limit) prevail.
+        kwargs = dict(scheduler_kwargs, time_limit=time_limit)
+        kwargs.update(configuration)
+        pool.apply_async(solve_in_worker, (tasks, kwargs),
+                         callback=on_result, error_callback=on_error)
+
+    deadline = start_time + grace_period + max(
+        configuration.get("time_limit", time_limit)
+        for configuration in configurations
+    )
+    n_pending = len(configurations)
+    first_success_time = None
+    try:
+        while n_pending:
+            timeout = deadline - time.time()
+            if first_success_time is not None:
+                timeout = min(timeout, first_success_time +
+                              first_success_patience - time.time())
+            if timeout <= 0:
+                break
+            try:
+                i, result = finished.get(timeout=timeout)
+            except queue.Empty:
+                break
+            results[i] = result
+            n_pending -= 1
+            if ((first_success_patience is not None) and
+                    (first_success_time is None) and
+                    (result[0] is not None)):
+                first_success_time = time.time()
+    finally:
+        # The workers still running are killed, their results are ignored.
+        pool.terminate()
+        pool.join()
+
+    schedules = [
+        None if records is None else records_to_schedule(tasks, records)
+        for (records, error, _) in results
+    ]
+    costs = [None if schedule is None else schedule_cost(schedule)
+             for schedule in schedules]
+    if stats is not None:
+        stats.update(costs=costs, best_configuration=None,
+                     errors=[error for (records, error, _) in results],
+                     solve_time=time.time() - start_time)
+    candidates = [(cost, i) for i, cost in enumerate(costs)
+                  if cost is not None]
+    if candidates == []:
+        raise NoSolutionError("No solution found by the schedulers "
+                              "portfolio !")
+    best_cost, best_index = min(candidates)
+    if stats is not None:
+        stats["best_configuration"] = configurations[best_index]
+    return apply_schedule(schedules[best_index])
+
+
+def solve_components_in_parallel(components, n_jobs=None,
+                                 **scheduler_kwargs):
+    """Schedule independent groups of tasks in parallel processes.
+
+    Each group of tasks (see ``independent_components``) is scheduled with
+    ``numberjack_scheduler`` in a worker process and the schedules are written
+    in the caller's tasks. A NoSolutionError (a ValueError) is raised if any
+    group could not be scheduled, mentioning the errors of the workers.
+
+    Returns the list of the statistics of the groups' schedulers (see the
+    ``stats`` parameter of ``numberjack_scheduler``).
+    """
+    if n_jobs is None:
+        n_jobs = min(len(components), os.cpu_count() or 1)
+    pool = Pool(n_jobs)
+    try:
+        results = pool.starmap(solve_in_worker, [
+            (component, scheduler_kwargs) for component in components
+        ])
+    finally:
+        pool.terminate()
+        pool.join()
+    errors = [error for (records, error, _) in results
+              if error is not None]
+    if errors:
+        raise NoSolutionError("The schedule optimizer failed: %s"
+                              % "; ".join(errors))
+    if any(records is None for (records, error, _) in results):
+        raise NoSolutionError("No solution found by the schedule optimizer !")
+    for component, (records, error, _) in zip(components, results):
+        apply_schedule(records_to_schedule(component, records))
+    return [stats for (records, error, stats) in results]
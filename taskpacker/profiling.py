@@ -0,0 +1,155 @@
+"""Observers notified at each phase of the schedulers, for profiling.
+
+``numberjack_scheduler`` and ``schedule_processes_series`` accept an
+``observer`` whose ``phase_started`` and ``phase_ended`` methods are called
+around each phase of the computations. The phases of
+``numberjack_scheduler`` are "horizon" (when ``upper_bound`` is "auto"),
+"filtering", "warm_start", "variables", "constraints", "bounds", "load",
+"solve" and "write_back". Each step of ``schedule_processes_series`` is a
+"series_step" phase, containing the phases of ``numberjack_scheduler``.
+When the problem is rescaled or decomposed, the phases of each sub-problem
+are also reported. If an error is raised during a phase, ``phase_ended``
+is still called for this phase (and the phases containing it) before the
+error is propagated.
+"""
+
+import time
+import tracemalloc
+from collections import defaultdict, OrderedDict
+
+
+class SchedulerObserver:
+    """Base class for observers, which ignores all notifications.
+
+    Subclasses can override ``phase_started`` and ``phase_ended``, e.g. to
+    export metrics.
+    """
+
+    def phase_started(self, phase):
+        pass
+
+    def phase_ended(self, phase):
+        pass
+
+
+class ObserverGroup(SchedulerObserver):
+    """Observer notifying several observers, in order."""
+
+    def __init__(self, observers):
+        self.observers = list(observers)
+
+    def phase_started(self, phase):
+        for observer in self.observers:
+            observer.phase_started(phase)
+
+    def phase_ended(self, phase):
+        for observer in self.observers[::-1]:
+            observer.phase_ended(phase)
+
+
+class PhaseTracker(SchedulerObserver):
+    """Observer passing the notifications on to another observer, and
+    keeping track of the phases started but not yet ended.
+
+    The schedulers use it to end the phases interrupted by an error, with
+    ``end_open_phases`` in a ``finally`` clause.
+    """
+
+    def __init__(self, observer=None):
+        self.observer = SchedulerObserver() if observer is None else observer
+        self.open_phases = []
+
+    def phase_started(self, phase):
+        self.open_phases.append(phase)
+        self.observer.phase_started(phase)
+
+    def phase_ended(self, phase):
+        index = max(i for i, name in enumerate(self.open_phases)
+                    if name == phase)
+        self.open_phases.pop(index)
+        self.observer.phase_ended(phase)
+
+    def end_open_phases(self):
+        """End all open phases, the most recently started first."""
+        while self.open_phases:
+            self.phase_ended(self.open_phases[-1])
+
+
+class PhaseTimer(SchedulerObserver):
+    """Observer measuring the total time spent in each phase.
+
+    Attributes ``durations`` and ``counts`` are dicts ``{phase: value}``
+    giving the total time in seconds spent in each phase and the number of
+    times the phase was run. Attribute ``runs`` is a dict
+    ``{phase: [duration_run_1, duration_run_2...]}``.
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.runs = defaultdict(list)
+        self._start_times = defaultdict(list)
+
+    def phase_started(self, phase):
+        self._start_times[phase].append(time.perf_counter())
+
+    def phase_ended(self, phase):
+        duration = time.perf_counter() - self._start_times[phase].pop()
+        self.durations[phase] += duration
+        self.counts[phase] += 1
+        self.runs[phase].append(duration)
+
+    def summary(self):
+        """Return a table (string) of the time spent in each phase."""
+        return "\n".join([
+            "%-12s %5d runs %10.4fs" % (phase, self.counts[phase], duration)
+            for phase, duration in sorted(self.durations.items(),
+                                          key=lambda item: -item[1])
+        ])
+
+
+class MemoryPeakObserver(SchedulerObserver):
+    """Observer measuring the peak memory allocated during each phase.
+
+    Memory is measured with ``tracemalloc`` (which slows down Python
+    code), started by the observer if it is not already tracing. The
+    ``peaks`` attribute is a dict ``{phase: bytes}`` giving, for each
+    phase, the largest increase of the traced memory during a run of this
+    phase.
+
+    Before Python 3.9 (without ``tracemalloc.reset_peak``), the traces are
+    cleared at each notification instead, so the memory freed afterwards
+    from earlier allocations is not counted and the peaks may be
+    overestimated.
+    """
+
+    def __init__(self):
+        self.peaks = OrderedDict()
+        self._open_phases = []
+        self._offset = 0
+
+    def _update_open_phases(self):
+        current, peak = tracemalloc.get_traced_memory()
+        current, peak = current + self._offset, peak + self._offset
+        for phase_info in self._open_phases:
+            phase_info[2] = max(phase_info[2], peak)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        else:
+            # The memory traced so far is kept as an offset.
+            tracemalloc.clear_traces()
+            self._offset = current
+        return current
+
+    def phase_started(self, phase):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        current = self._update_open_phases()
+        self._open_phases.append([phase, current, current])
+
+    def phase_ended(self, phase):
+        self._update_open_phases()
+        index = max(i for i, (name, start, peak)
+                    in enumerate(self._open_phases) if name == phase)
+        name, start, peak = self._open_phases.pop(index)
+        self.peaks[phase] = max(self.peaks.get(phase, 0), peak - start)
@@ -0,0 +1,101 @@
+"""Reports on the resolution of scheduling problems."""
+
+from collections import OrderedDict
+
+
+class SolveReport:
+    """Sizes, timings and search statistics of a scheduler run.
+
+    Parameters
+    ----------
+
+    status
+      How the search ended: "optimal" (the schedule is proven optimal),
+      "satisfied" (a schedule respecting the due times was found, when not
+      optimizing), "stopped" (stopped by ``gap_limit`` or ``on_solution``),
+      "time_limit" (time limit reached, with or without a schedule),
+      "infeasible" (no schedule exists within the bounds), "feasible" (the
+      warm-start schedule is returned, the solver finding no schedule), or
+      "greedy" (the schedule was computed without solver).
+
+    cost
+      Cost of the schedule returned (see ``schedule_cost``), None if no
+      schedule was found.
+
+    gap
+      Relative gap between ``cost`` and the lower bound of the cost.
+
+    n_variables, n_constraints
+      Size of the solver's model.
+
+    n_disjunctions
+      Dict ``{resource_name: n}`` giving for each resource the number of
+      pairs of tasks whose possible overlap is modelled by a disjunction.
+
+    model_build_time, solver_load_time, solve_time
+      Time in seconds spent building the model, loading it in the solver,
+      and searching.
+
+    nodes, backtracks, fails, propagations
+      Search statistics reported by the solver.
+
+    stats
+      The full dict of statistics (see ``numberjack_scheduler``), which also
+      has the number of tasks, precedences, the lower bounds, etc.
+
+    """
+
+    fields = ("status", "cost", "gap", "n_variables", "n_constraints",
+              "n_disjunctions", "model_build_time", "solver_load_time",
+              "solve_time", "nodes", "backtracks", "fails", "propagations")
+
+    def __init__(self, status=None, cost=None, gap=None, n_variables=None,
+                 n_constraints=None, n_disjunctions=None,
+                 model_build_time=None, solver_load_time=None,
+                 solve_time=None, nodes=None, backtracks=None, fails=None,
+                 propagations=None, stats=None):
+        self.status = status
+        self.cost = cost
+        self.gap = gap
+        self.n_variables = n_variables
+        self.n_constraints = n_constraints
+        self.n_disjunctions = n_disjunctions
+        self.model_build_time = model_build_time
+        self.solver_load_time = solver_load_time
+        self.solve_time = solve_time
+        self.nodes = nodes
+        self.backtracks = backtracks
+        self.fails = fails
+        self.propagations = propagations
+        self.stats = {} if stats is None else stats
+
+    @staticmethod
+    def from_stats(stats):
+        """Create a report from a ``numberjack_scheduler`` stats dict."""
+        return SolveReport(stats=stats, **{
+            field: stats[field]
+            for field in SolveReport.fields
+            if field in stats
+        })
+
+    def to_dict(self):
+        return OrderedDict([
+            (field, getattr(self, field))
+            for field in self.fields
+        ])
+
+    def __repr__(self):
+        return "SolveReport(%s)" % ", ".join([
+            "%s=%s" % (field, value)
+            for field, value in self.to_dict().items()
+            if (value is not None) and (field != "n_disjunctions")
+        ])
+
+
+class NoSolutionError(ValueError):
+    """Raised when no schedule could be found. The ``report`` attribute
+    is a ``SolveReport`` (or None) telling how the search went."""
+
+    def __init__(self, message, report=None):
+        ValueError.__init__(self, message)
+        self.report = report
@@ -0,0 +1,93 @@
+"""Detection of interchangeable processes in a scheduling problem.
+
+Processes created from the same template (e.g. several work units read from
+the same spreadsheet) have identical tasks. Any schedule stays valid, with the
+same cost, when two such processes exchange their times and slots, so the
+solver can be told to only consider one ordering of these processes.
+"""
+
+from collections import defaultdict
+
+
+def unscheduled_processes(tasks):
+    """Return the groups of unscheduled tasks connected by dependencies.
+
+    Each process is a list of tasks, in the order of ``tasks``, and the
+    processes are sorted by order of their first task in ``tasks``.
+    """
+    free_tasks = [task for task in tasks if task.scheduled_start is None]
+    parents = {task: task for task in free_tasks}
+
+    def find(task):
+        while parents[task] is not task:
+            parents[task] = parents[parents[task]]
+            task = parents[task]
+        return task
+
+    for task in free_tasks:
+        for parent in task.follows:
+            if parent in parents:
+                parents[find(parent)] = find(task)
+    processes = defaultdict(list)
+    for task in free_tasks:
+        processes[find(task)].append(task)
+    position = {task: i for i, task in enumerate(free_tasks)}
+    return sorted(processes.values(),
+                  key=lambda process: position[process[0]])
+
+
+def identical_processes(tasks, start_windows=None):
+    """Return the groups of interchangeable unscheduled processes.
+
+    Two processes (see ``unscheduled_processes``) are interchangeable if
+    their tasks, taken in order, have the same durations, resources, preset
+    slots (``scheduled_resources``), ``max_wait``, ``due_time``,
+    ``priority`` and start windows, the same dependencies inside the
+    process, and depend on (or are followed by) the same tasks outside of
+    the process.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks.
+
+    start_windows
+      Optional dict ``{task: (earliest_start, latest_start)}`` (see
+      ``numberjack_scheduler``).
+
+    Returns
+    -------
+
+    groups
+      A list of groups of at least two processes, each process being a list
+      of tasks. The n-th tasks of the processes of a same group correspond to
+      each other.
+
+    """
+    start_windows = {} if start_windows is None else start_windows
+    external_children = defaultdict(list)
+    for task in tasks:
+        if task.scheduled_start is not None:
+            for parent in task.follows:
+                external_children[parent].append(task)
+
+    def signature(process):
+        index = {task: i for i, task in enumerate(process)}
+        return tuple(
+            (task.duration, tuple(task.resources),
+             tuple((task.scheduled_resources or {}).get(resource)
+                   for resource in task.resources), task.max_wait,
+             task.due_time, task.priority, start_windows.get(task),
+             tuple(index[parent] for parent in task.follows
+                   if parent in index),
+             tuple(parent for parent in task.follows
+                   if parent not in index),
+             tuple(external_children[task]))
+            for task in process
+        )
+
+    groups = defaultdict(list)
+    for process in unscheduled_processes(tasks):
+        groups[signature(process)].append(process)
+    return [group for group in groups.values() if len(group) > 1]
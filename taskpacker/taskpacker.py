@@ -1,9 +1,24 @@
-import uuid
+import time
+import heapq
 from tqdm import tqdm
-import Numberjack as nj
 import itertools as itt
+from bisect import bisect_left
 from copy import copy
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+
+from .greedy import greedy_schedule, greedy_scheduler
+from .symmetries import identical_processes
+from .report import SolveReport, NoSolutionError
+from .profiling import SchedulerObserver, PhaseTracker
+from .timescale import time_granularity, scale_tasks
+from .bounds import (earliest_starts, latest_starts, lower_bounds,
+                     optimality_gap)
+
+try:
+    import Numberjack as nj
+    NUMBERJACK_AVAILABLE = True
+except ImportError:
+    NUMBERJACK_AVAILABLE = False
 
 class Task:
     """ Tasks are the steps of a work unit, performed using specific resources.
@@ -25,6 +40,13 @@ class Task:
 
     """
 
+    __slots__ = ("resources", "duration", "name", "scheduled_start",
+                 "scheduled_resources", "follows", "max_wait", "color",
+                 "priority", "due_time", "id")
+
+    # Source of the process-unique ids of the tasks.
+    _ids = itt.count()
+
     def __init__(self, name, resources, duration, follows=(), max_wait=None,
                  scheduled_start=None, scheduled_resources=None,
                  priority=1, due_time=None, color='blue'):
@@ -40,7 +62,7 @@ class Task:
         self.priority = priority
         self.due_time = due_time
 
-        self.id = self.name + str(uuid.uuid1().int)
+        self.id = next(Task._ids)
 
     @property
     def scheduled_end(self):
@@ -50,10 +72,10 @@ class Task:
             return self.scheduled_start + self.duration
 
     def __repr__(self):
-        return "Task(%(name)s, %(duration)s)" % self.__dict__
+        return "Task(%s, %s)" % (self.name, self.duration)
 
     def __hash__(self):
-        return hash(self.id)
+        return self.id
 
     def to_dict(self):
         def color_to_html(color):
@@ -90,6 +112,8 @@ class Resource:
 
     """
 
+    __slots__ = ("full_name", "name", "capacity")
+
     def __init__(self, name, full_name=None, capacity=1):
         self.full_name = name if full_name is None else full_name
         self.name = name
@@ -98,9 +122,15 @@ class Resource:
     def __repr__(self):
         return self.name
 
-    def hash(self):
+    def __hash__(self):
         return hash(self.name)
 
+    def __eq__(self, other):
+        return isinstance(other, Resource) and (other.name == self.name)
+
+    def __ne__(self, other):
+        return not (self == other)
+
     def to_dict(self):
         return OrderedDict([
             (k, '' if v is None else v)
@@ -117,7 +147,15 @@ def numberjack_scheduler(tasks, upper_bound=500,
                          optimize=True, time_limit=5,
                          solver_method="Mistral",
                          randomization=False,
-                         verbose_solver=False):
+                         verbose_solver=False,
+                         capacity_model="slots", stats=None,
+                         warm_start=False, tighten_domains=False,
+                         gap_limit=None, heuristic=None, random_seed=None,
+                         freeze_scheduled=False, decompose=False,
+                         n_jobs=1, time_step="auto", coarse_time_step=None,
+                         refine_window=None, start_windows=None,
+                         break_symmetries=False, on_solution=None,
+                         return_report=False, observer=None):
     """Makes an optimized schedule for the processes.
 
     Examples
@@ -136,7 +174,9 @@ def numberjack_scheduler(tasks, upper_bound=500,
 
     upper_bound
       Upper bound for the time. The unit depends on the unit
-      chosen for the duration of the work unit's tasks.
+      chosen for the duration of the work unit's tasks. If "auto", the end of
+      a schedule computed with ``greedy_schedule`` is used, and the domain of
+      each task is tightened (see ``tighten_domains``).
 
     optimize
       If false, any solution satisfying the constraints (including deadlines)
@@ -150,15 +190,187 @@ def numberjack_scheduler(tasks, upper_bound=500,
       because of this time limit the solution may not be optimal.
 
     solver_method
-      The solver used by NumberJack (see NumberJack docs).
+      The solver used by NumberJack (see NumberJack docs), or "greedy" to
+      use the much faster (but not optimizing) list scheduler
+      ``greedy_scheduler``, which needs no solver.
+
+    capacity_model
+      How resources with a capacity > 1 are modeled. With "slots" (default)
+      each task gets a slot variable per resource and a disjunction is posted
+      for every pair of tasks sharing the resource. With "cumulative" only
+      the number of tasks running at the same time is limited to the
+      capacity (no slot variables), and the slots are assigned after the
+      solve by interval colouring, so ``scheduled_resources`` has the same
+      form in both modes. The already-scheduled tasks are counted as running
+      tasks, and keep their slots unless no free slot is then left to some
+      other task: all the slots of the resource are then re-assigned (the
+      times of the tasks never change). Resources on which unscheduled tasks
+      already have a slot are modeled with slots in both modes. In both
+      modes, only the pairs of tasks whose possible time windows overlap are
+      constrained, so the model only grows quadratically with the number of
+      tasks when the windows are wide (use ``tighten_domains`` to narrow
+      them). The cumulative model has fewer variables, but as each pair of
+      tasks gives two reified comparisons (one per task start) it has more
+      constraints than the slots model.
+
+    stats
+      Optional dict which will be filled with the number of tasks, frozen
+      tasks and precedences in the model, and with the time (in seconds)
+      spent building the model (``model_build_time``), loading it in the
+      solver (``solver_load_time``) and solving it (``solve_time``). It also
+      gets the ``lower_bounds`` of the problem (see ``bounds.lower_bounds``),
+      the ``cost`` of the schedule found (see ``schedule_cost``), the relative
+      ``gap`` between this cost and its lower bound, and the ``time_step``
+      used when it is greater than 1 (model statistics are then in this unit).
+      Finally it gets the model size (``n_variables``, ``n_constraints``, and
+      ``n_disjunctions`` per resource), the solver's search statistics
+      (``nodes``, ``backtracks``, ``fails``, ``propagations``) and the
+      ``status`` of the search, see ``SolveReport``.
+
+    warm_start
+      If True, a feasible schedule is first computed with ``greedy_schedule``
+      (keeping the already-scheduled tasks in place). It is returned if the
+      solver finds no better schedule within the time limit (instead of
+      raising an error), with status "feasible" unless the solver proved it
+      optimal.
+
+    tighten_domains
+      If True, the start of each task is restricted to the times between
+      its earliest start (given the tasks it follows and ``lower_bound``) and
+      its latest start (given the tasks following it and ``upper_bound``),
+      instead of the whole ``[lower_bound, upper_bound]`` window.
+
+    gap_limit
+      If provided (and ``optimize`` is True), the solver stops as soon as it
+      finds a schedule whose cost is within this relative gap (e.g. 0.05 for
+      5%) of the cost lower bound, instead of searching until the time limit.
+
+    heuristic
+      Optional search heuristic passed to the solver's ``setHeuristic``, for
+      instance ``("DomainOverWDegree", "Random")`` (see NumberJack docs).
+
+    random_seed
+      Optional seed of the solver's random generator (useful with
+      ``randomization``).
+
+    freeze_scheduled
+      If True, the already-scheduled tasks are not represented by solver
+      variables but as constant occupation intervals of their resources (and
+      constant release times or deadlines for the tasks depending on them).
+      Scheduled tasks ending before the earliest possible start of the
+      unscheduled tasks are left out of the model altogether, so the model
+      size only depends on the tasks in the scheduling window.
+
+    decompose
+      If True, the tasks are split into groups sharing no resource (other
+      than resources with an 'inf' capacity) and no dependency, see
+      ``independent_components``, and each group is scheduled separately as
+      a smaller problem. The ``stats``, if provided, then get the stats of
+      each group in ``components``.
+
+    n_jobs
+      Number of processes used to schedule the groups of tasks in parallel
+      when ``decompose`` is True.
+
+    time_step
+      Time unit used in the solver's model. If "auto", the largest time step
+      dividing all durations, max waits, due times and scheduled starts is
+      used (see ``timescale.time_granularity``), which gives an equivalent
+      problem with domains smaller by this factor.
+
+    coarse_time_step
+      If provided, a coarse version of the problem, with all times rounded to
+      this time step, is solved first. The problem is then solved at full
+      resolution with each task starting within ``refine_window`` of its
+      start in the coarse schedule (or without these windows if this fails).
+      Each solve has its own ``time_limit``.
+
+    refine_window
+      See ``coarse_time_step``. Defaults to twice the coarse time step.
+
+    start_windows
+      Optional dict ``{task: (earliest_start, latest_start)}`` restricting
+      the start of some of the unscheduled tasks.
+
+    break_symmetries
+      If True, constraints removing equivalent schedules are added to the
+      model: interchangeable processes (see
+      ``symmetries.identical_processes``) must start in the order of the
+      tasks list, and the slots of multi-slot resources are used in the
+      order of the tasks list. No schedule is lost, up to these exchanges.
+
+    on_solution
+      Optional function ``f(schedule, cost, elapsed_time)`` called each time
+      a better schedule is found (starting with the warm-start schedule, if
+      any), where ``schedule`` is a dict ``{task: (start, slots)}`` (without
+      the slots of cumulative resources), ``cost`` its ``schedule_cost``
+      (including frozen tasks) and ``elapsed_time`` the time in seconds since
+      the function was called. If ``f`` returns True the search stops and
+      the last schedule found is used. With ``decompose``, it is called for
+      each group of tasks (and not at all if ``n_jobs > 1``).
+
+    return_report
+      If True, a ``SolveReport`` summarizing the ``stats`` (model size,
+      timings, search statistics, cost and termination status) is returned
+      with the tasks.
+
+    observer
+      Optional ``profiling.SchedulerObserver`` notified at the start and end
+      of each phase of the computations (e.g. a ``profiling.PhaseTimer``).
+
+    Returns
+    -------
+
+    tasks
+      The list of scheduled tasks (or ``(tasks, report)`` if
+      ``return_report`` is True). A ``NoSolutionError`` (a subclass of
+      ValueError) with a ``report`` attribute is raised if no schedule could
+      be found.
 
     """
+    # Parameters passed on when the problem is rescaled or decomposed.
+    parameters = {name: value for (name, value) in locals().items()
+                  if name not in ("tasks", "stats", "return_report")}
 
-    ZERO = nj.Variable([0])
-    C_LOWER_BOUND = 0
+    if return_report:
+        stats = {} if stats is None else stats
+        scheduled_tasks = numberjack_scheduler(tasks, stats=stats,
+                                               **parameters)
+        return scheduled_tasks, SolveReport.from_stats(stats)
 
-    # Create Numberjack variables to represent the tasks
-    # ( starting times and resource instance that they use).
+    if capacity_model not in ("slots", "cumulative"):
+        raise ValueError("capacity_model should be 'slots' or 'cumulative', "
+                         "not %s" % capacity_model)
+
+    if not isinstance(observer, PhaseTracker):
+        # The phases interrupted by an error are ended all the same.
+        tracker = PhaseTracker(observer)
+        try:
+            return numberjack_scheduler(tasks, stats=stats,
+                                        return_report=False,
+                                        **dict(parameters, observer=tracker))
+        finally:
+            tracker.end_open_phases()
+
+    build_start_time = time.time()
+    greedy_solution = None
+    if upper_bound == "auto":
+        observer.phase_started("horizon")
+        tighten_domains = True
+        try:
+            greedy_solution = greedy_schedule(tasks, lower_bound=lower_bound)
+            upper_bound = max([start + task.duration for task, (start, slots)
+                               in greedy_solution.items()] + [0])
+        except ValueError:
+            # Fall back to a horizon where all tasks could be run in series.
+            upper_bound = max(
+                [lower_bound or 0] +
+                [task.scheduled_end for task in tasks
+                 if task.scheduled_end is not None]
+            ) + sum(task.duration for task in tasks)
+        observer.phase_ended("horizon")
+
+    observer.phase_started("filtering")
     tasks = [
         task for task in tasks
         if ((task.scheduled_start is None) or
@@ -170,23 +382,275 @@ def numberjack_scheduler(tasks, upper_bound=500,
          (lower_bound is not None) and
          (task.scheduled_end > lower_bound)))
     ]
+    observer.phase_ended("filtering")
+
+    if solver_method == "greedy":
+        greedy_scheduler(tasks, upper_bound=upper_bound,
+                         lower_bound=lower_bound)
+        if stats is not None:
+            stats.update(status="greedy", cost=schedule_cost(tasks),
+                         solve_time=time.time() - build_start_time)
+        if on_solution is not None:
+            on_solution({task: (task.scheduled_start, task.scheduled_resources)
+                         for task in tasks}, schedule_cost(tasks),
+                        time.time() - build_start_time)
+        return tasks
+    if not NUMBERJACK_AVAILABLE:
+        raise ImportError("Install Numberjack to use solver_method='%s', or "
+                          "use solver_method='greedy'." % solver_method)
+
+    parameters.update(upper_bound=upper_bound,
+                      tighten_domains=tighten_domains)
+
+    if time_step == "auto":
+        # The bounds and windows must be multiples of the time step too, so
+        # that the scaled problem is equivalent to the original one.
+        time_step = time_granularity(tasks, [lower_bound, upper_bound] + [
+            time for window in (start_windows or {}).values()
+            for time in window
+        ])
+    if time_step > 1:
+        # Solve the equivalent problem where times are in units of time_step.
+        scaled_tasks, copies = scale_tasks(tasks, time_step)
+
+        def scale_up(value):
+            return None if value is None else -(-value // time_step)
+
+        originals = {task_copy: task for task, task_copy in copies.items()}
+        # (computed before the tasks are scheduled)
+        bounds = lower_bounds(tasks, lower_bound=lower_bound)
+
+        def on_scaled_solution(schedule, cost, elapsed_time):
+            schedule = {originals[task]: (start * time_step, slots)
+                        for task, (start, slots) in schedule.items()}
+            full_schedule = {
+                task: (task.scheduled_start, task.scheduled_resources)
+                for task in tasks
+                if task.scheduled_start is not None
+            }
+            full_schedule.update(schedule)
+            return on_solution(schedule, schedule_cost(full_schedule),
+                               elapsed_time)
+
+        numberjack_scheduler(
+            scaled_tasks, stats=stats, **dict(
+                parameters, time_step=1,
+                upper_bound=upper_bound // time_step,
+                lower_bound=scale_up(lower_bound),
+                on_solution=on_solution and on_scaled_solution,
+                coarse_time_step=scale_up(coarse_time_step),
+                refine_window=scale_up(refine_window),
+                start_windows=None if start_windows is None else {
+                    copies[task]: (scale_up(earliest), latest // time_step)
+                    for task, (earliest, latest) in start_windows.items()
+                }))
+        for task in tasks:
+            if copies[task].scheduled_start is not None:
+                task.scheduled_start = (copies[task].scheduled_start *
+                                        time_step)
+                task.scheduled_resources = copies[task].scheduled_resources
+        if stats is not None:
+            cost = schedule_cost(tasks)
+            stats.update(time_step=time_step, lower_bounds=bounds, cost=cost,
+                         gap=optimality_gap(cost, bounds["cost"]))
+        return tasks
+
+    if (coarse_time_step is not None) and (coarse_time_step > 1):
+        # Solve a coarse version of the problem, then solve the problem at
+        # full resolution around the coarse schedule.
+        coarse_tasks, copies = scale_tasks(tasks, coarse_time_step,
+                                           exact=False)
+        try:
+            numberjack_scheduler(coarse_tasks, **dict(
+                parameters, time_step=1, coarse_time_step=None,
+                start_windows=None, decompose=False, on_solution=None,
+                upper_bound=-(-upper_bound // coarse_time_step),
+                lower_bound=None if lower_bound is None else
+                -(-lower_bound // coarse_time_step)))
+        except ValueError:
+            pass
+        else:
+            if refine_window is None:
+                refine_window = 2 * coarse_time_step
+            windows = {
+                task: (coarse_time_step * copies[task].scheduled_start -
+                       refine_window,
+                       coarse_time_step * copies[task].scheduled_start +
+                       refine_window)
+                for task in tasks
+                if task.scheduled_start is None
+            }
+            try:
+                return numberjack_scheduler(tasks, stats=stats, **dict(
+                    parameters, coarse_time_step=None, start_windows=windows))
+            except ValueError:
+                pass
+
+    if decompose:
+        components = independent_components(tasks)
+        if len(components) > 1:
+            components_parameters = dict(
+                parameters, time_step=1, coarse_time_step=None,
+                decompose=False)
+            components_stats = [{} for component in components]
+            # (computed before the tasks are scheduled)
+            cost_lower_bound = lower_bounds(
+                tasks, lower_bound=lower_bound)["cost"]
+            if n_jobs > 1:
+                from .parallel import solve_components_in_parallel
+                components_stats = solve_components_in_parallel(
+                    components, **dict(components_parameters,
+                                       on_solution=None, observer=None))
+            else:
+                for component, component_stats in zip(components,
+                                                      components_stats):
+                    numberjack_scheduler(component, stats=component_stats,
+                                         **components_parameters)
+            if stats is not None:
+                cost = schedule_cost(tasks)
+                # The status of the least successful component.
+                statuses = [component_stats.get("status")
+                            for component_stats in components_stats]
+                status_ranks = [None, "time_limit", "feasible", "stopped",
+                                "greedy", "satisfied", "optimal"]
+                status = min(statuses, key=status_ranks.index)
+                stats.update(n_components=len(components),
+                             components=components_stats,
+                             status=status,
+                             solve_time=time.time() - build_start_time,
+                             cost=cost,
+                             gap=0.0 if status == "optimal" else
+                             optimality_gap(cost, cost_lower_bound))
+            return tasks
+
+    stats = {} if stats is None else stats
+    C_LOWER_BOUND = 0
+
+    incumbent = None
+    stop_search = False
+    if warm_start:
+        observer.phase_started("warm_start")
+        try:
+            incumbent = greedy_solution or greedy_schedule(
+                tasks, lower_bound=lower_bound)
+        except ValueError:
+            pass
+        else:
+            ends = [start + task.duration
+                    for task, (start, slots) in incumbent.items()]
+            if (max(ends + [0]) > upper_bound) or not (
+                    optimize or all(end < task.due_time
+                                    for task, end in zip(incumbent, ends)
+                                    if task.due_time is not None)):
+                incumbent = None
+        observer.phase_ended("warm_start")
+    if incumbent is not None:
+        incumbent_cost = schedule_cost(incumbent)
+        if on_solution is not None:
+            stop_search = on_solution(incumbent, incumbent_cost,
+                                      time.time() - build_start_time)
+
+    if freeze_scheduled:
+        # Only the unscheduled tasks are represented by variables. The
+        # scheduled tasks which could overlap with them are kept as frozen
+        # (constant) intervals.
+        model_tasks = [t for t in tasks if t.scheduled_start is None]
+        heads = earliest_starts(tasks, lower_bound=lower_bound)
+        window_start = min([heads[t] for t in model_tasks] + [upper_bound])
+        frozen_tasks = [t for t in tasks if (t.scheduled_start is not None)
+                        and (t.scheduled_end > window_start)]
+    else:
+        model_tasks = tasks
+        frozen_tasks = []
+    model_tasks_set = set(model_tasks)
+    frozen_cost = schedule_cost([t for t in tasks
+                                 if t not in model_tasks_set])
+
+    # Index the tasks of each resource and the precedence edges once, so
+    # that the constraints below never rescan the whole tasks list.
+    resources_tasks = OrderedDict()
+    for task in model_tasks:
+        for resource in task.resources:
+            resources_tasks.setdefault(resource, []).append(task)
+    resources_frozen_tasks = defaultdict(list)
+    for task in frozen_tasks:
+        for resource in task.resources:
+            resources_frozen_tasks[resource].append(task)
+    precedences = [
+        (task, next_task)
+        for next_task in model_tasks
+        for task in next_task.follows
+        if task in model_tasks_set
+    ]
+    frozen_precedences = [
+        (task, next_task)
+        for next_task in tasks
+        for task in next_task.follows
+        if (task in model_tasks_set) != (next_task in model_tasks_set)
+    ]
+
+    observer.phase_started("variables")
+
+    # Create Numberjack variables to represent the tasks
+    # ( starting times and resource instance that they use).
+    if tighten_domains:
+        heads = earliest_starts(tasks, lower_bound=lower_bound)
+        latest = latest_starts(tasks, horizon=upper_bound)
+        if any(heads[task] > latest[task] for task in tasks):
+            stats["status"] = "infeasible"
+            raise NoSolutionError("No solution found by the schedule "
+                                  "optimizer ! (the horizon is too short)",
+                                  report=SolveReport.from_stats(stats))
+
     nj_tasks = {}
-    for task in tasks:
+    # Times between which each task can run (fixed for scheduled tasks).
+    windows = {task: (task.scheduled_start, task.scheduled_end)
+               for task in frozen_tasks}
+    for task in model_tasks:
 
         if task.scheduled_start is None:
-            if lower_bound is not None:
-                new_nj_task = nj.Task(lower_bound, upper_bound, task.duration)
+            if tighten_domains:
+                earliest, latest_start = heads[task], latest[task]
             else:
-                new_nj_task = nj.Task(upper_bound, task.duration)
+                earliest = 0 if lower_bound is None else lower_bound
+                latest_start = upper_bound - task.duration
+            if (start_windows is not None) and (task in start_windows):
+                window_start, window_end = start_windows[task]
+                earliest = max(earliest, window_start)
+                latest_start = min(latest_start, window_end)
+                if earliest > latest_start:
+                    stats["status"] = "infeasible"
+                    raise NoSolutionError(
+                        "No solution found by the schedule optimizer ! "
+                        "(empty start window)",
+                        report=SolveReport.from_stats(stats))
+            new_nj_task = nj.Task(earliest, latest_start + task.duration,
+                                  task.duration)
+            windows[task] = (earliest, latest_start + task.duration)
         else:
             new_nj_task = nj.Task(
                 task.scheduled_start,
                 task.scheduled_end,
                 task.duration
             )
+            windows[task] = (task.scheduled_start, task.scheduled_end)
         new_nj_task.name = task.name
         nj_tasks[task] = new_nj_task
 
+    # In cumulative mode, the scheduled tasks are a fixed usage of their
+    # resources, and their slots are re-assigned after the solve if needed.
+    # Resources on which unscheduled tasks already have a slot keep slot
+    # variables, as these slots can't be re-assigned.
+    preslotted_resources = set(
+        resource for task in model_tasks
+        if task.scheduled_start is None
+        for resource in (task.scheduled_resources or {}))
+
+    def is_cumulative(resource):
+        return ((capacity_model == "cumulative") and
+                (resource.capacity not in ('inf', 1)) and
+                (resource not in preslotted_resources))
+
     nj_taskresources = {
         task: {
             resource: (
@@ -197,41 +661,127 @@ def numberjack_scheduler(tasks, upper_bound=500,
                 nj.Variable([task.scheduled_resources[resource]])
             )
             for resource in task.resources
+            # In cumulative mode slots are assigned after the solve.
+            if not is_cumulative(resource)
         }
-        for task in tasks
+        for task in model_tasks
     }
 
-    all_resources = list(set([
-        resource
-        for task in tasks
-        for resource in task.resources
-    ]))
-
+    observer.phase_ended("variables")
+    observer.phase_started("constraints")
     model = nj.Model()
+    n_disjunctions = {}
+
+    n_symmetry_constraints = 0
+    if break_symmetries:
+        for processes in identical_processes(model_tasks, start_windows):
+            for process, next_process in zip(processes, processes[1:]):
+                model.add(nj_tasks[process[0]] <= nj_tasks[next_process[0]])
+                n_symmetry_constraints += 1
 
-    for resource in all_resources:
+    for resource, resource_tasks in resources_tasks.items():
 
+        frozen_resource_tasks = resources_frozen_tasks[resource]
         if resource.capacity == 'inf':
             continue
-        elif resource.capacity == 1:
+        # Only the tasks whose windows overlap can compete for the resource,
+        # so the constraints are only posted for these pairs of tasks. The
+        # frozen task is always second in the pairs with a frozen task.
+        all_resource_tasks = resource_tasks + frozen_resource_tasks
+        n_model_tasks = len(resource_tasks)
+        pairs, frozen_pairs = [], []
+        for (i, j) in overlapping_pairs([windows[task]
+                                         for task in all_resource_tasks]):
+            if i >= n_model_tasks:
+                i, j = j, i
+            if i >= n_model_tasks:
+                continue
+            (pairs if j < n_model_tasks else frozen_pairs).append(
+                (all_resource_tasks[i], all_resource_tasks[j]))
+        neighbours = defaultdict(list)
+        for (task, other_task) in pairs + frozen_pairs:
+            neighbours[task].append(other_task)
+            neighbours[other_task].append(task)
+        n_disjunctions[resource.name] = len(pairs) + len(frozen_pairs)
+        if is_cumulative(resource):
+            # At the start of each task, the number of other tasks running
+            # on the resource must leave at least one free slot. (Lt is used
+            # explicitly as "task < x" means "task ends before x" for tasks.)
+            for task in resource_tasks:
+                running_tasks = [
+                    nj.And([
+                        nj_tasks[other_task] <= nj_tasks[task],
+                        nj.Lt([nj_tasks[task],
+                               nj_tasks[other_task] + other_task.duration])
+                    ])
+                    for other_task in neighbours[task]
+                    if other_task in nj_tasks
+                ] + [
+                    nj.And([
+                        nj_tasks[task] >= frozen_task.scheduled_start,
+                        nj.Lt([nj_tasks[task], frozen_task.scheduled_end])
+                    ])
+                    for frozen_task in neighbours[task]
+                    if frozen_task not in nj_tasks
+                ]
+                if len(running_tasks) >= resource.capacity:
+                    model.add(nj.Sum(running_tasks) < resource.capacity)
+            # Same at the start of each frozen task.
+            for frozen_task in frozen_resource_tasks:
+                start = frozen_task.scheduled_start
+                n_free_slots = resource.capacity - len([
+                    other_task for other_task in frozen_resource_tasks
+                    if other_task.scheduled_start <= start <
+                    other_task.scheduled_end
+                ])
+                running_tasks = [
+                    nj.And([nj_tasks[task] <= start,
+                            start < nj_tasks[task] + task.duration])
+                    for task in neighbours[frozen_task]
+                    if windows[task][0] <= start < windows[task][1]
+                ]
+                if len(running_tasks) > n_free_slots:
+                    model.add(nj.Sum(running_tasks) <= n_free_slots)
+            continue
+
+        if break_symmetries and (frozen_resource_tasks == []) and all(
+                task.scheduled_resources is None for task in resource_tasks):
+            # The slots are interchangeable: the n-th task of the resource
+            # can only use one of the n first slots.
+            for i, task in enumerate(resource_tasks[:resource.capacity - 1]):
+                model.add(nj_taskresources[task][resource] <= i + 1)
+                n_symmetry_constraints += 1
+
+        for (task, frozen_task) in frozen_pairs:
+            # The task cannot overlap with frozen tasks (in the same slot).
+            different_times = nj.Or([
+                nj_tasks[task] + task.duration <= frozen_task.scheduled_start,
+                nj_tasks[task] >= frozen_task.scheduled_end
+            ])
+            frozen_slot = (frozen_task.scheduled_resources or {}).get(
+                resource, None)
+            if (resource.capacity == 1) or (frozen_slot is None):
+                model.add(different_times)
+            else:
+                model.add(nj.Or([
+                    different_times,
+                    nj_taskresources[task][resource] != frozen_slot
+                ]))
+
+        if resource.capacity == 1:
             # The resource has one slot: Only one job at the same time
             model.add(nj.UnaryResource([
-                nj_tasks[task] for task in tasks
-                if (resource in task.resources)
+                nj_tasks[task] for task in resource_tasks
             ]))
         else:
             # The resource has several slots
-            tasks_pairs_sharing_resource = [
-                (task, other_task)
-                for (task, other_task) in itt.combinations(tasks, 2)
-                if ((resource in task.resources) and
-                    (resource in other_task.resources))
-            ]
-            for (task, other_task) in tasks_pairs_sharing_resource:
+            for (task, other_task) in pairs:
 
+                # (the tasks can follow each other in any order)
                 different_times = nj.Or([
                     nj_tasks[task] + task.duration <= nj_tasks[other_task],
-                    nj_tasks[other_task] + other_task.duration < nj_tasks[task]
+                    nj_tasks[other_task] + other_task.duration <=
+                    nj_tasks[task]
                 ])
                 different_resources = nj.AllDiff([
                     nj_taskresources[task][resource],
@@ -241,36 +791,50 @@ def numberjack_scheduler(tasks, upper_bound=500,
                 different_resources.ub = 1
                 model.add(nj.Or([different_times, different_resources]))
 
-    model.add([
-        (nj_tasks[task] + task.duration <= nj_tasks[next_task])
-        for next_task in tasks
-        for task in next_task.follows
-    ])
+    for (task, next_task) in precedences:
+        model.add(nj_tasks[task] + task.duration <= nj_tasks[next_task])
+        if next_task.max_wait is not None:
+            model.add(nj_tasks[next_task] <= nj_tasks[task] +
+                      task.duration + next_task.max_wait)
 
-    model.add([
-        (nj_tasks[next_task] <= nj_tasks[task] +
-         task.duration + next_task.max_wait)
-        for next_task in tasks
-        for task in next_task.follows
-        if next_task.max_wait is not None
-    ])
+    for (task, next_task) in frozen_precedences:
+        if task in nj_tasks:
+            # The task must end before the frozen next task starts.
+            model.add(nj_tasks[task] + task.duration <=
+                      next_task.scheduled_start)
+            if next_task.max_wait is not None:
+                model.add(next_task.scheduled_start <= nj_tasks[task] +
+                          task.duration + next_task.max_wait)
+        elif task.scheduled_start is not None:
+            # The next task must start after the frozen task ends.
+            model.add(nj_tasks[next_task] >= task.scheduled_end)
+            if next_task.max_wait is not None:
+                model.add(nj_tasks[next_task] <= task.scheduled_end +
+                          next_task.max_wait)
 
     if optimize:
+        # The cost of a warm-start schedule is not used as a cutoff: Mistral
+        # can crash or wrongly fail on such tightly-bounded objectives.
         C_max = nj.Variable(C_LOWER_BOUND, 150000000, 'C_max')
+        # The lateness of a task is a non-negative variable at least equal to
+        # its end minus its due time, which the minimization makes tight
+        # (Mistral prunes optimal schedules when propagating a Max). Tasks
+        # which can't end after their due time have no lateness term.
+        lateness_terms = []
+        for task in model_tasks:
+            if (task.due_time is None) or (windows[task][1] <= task.due_time):
+                continue
+            lateness = nj.Variable(0, windows[task][1] - task.due_time)
+            model.add(lateness >= nj_tasks[task] + task.duration -
+                      task.due_time)
+            lateness_terms.append(lateness * (1000 * task.priority))
         model.add(
             C_max >
-            sum([
-                nj.Max([ZERO, nj_tasks[task] +
-                        task.duration -
-                        task.due_time]) *
-                (1000 * task.priority)
-                for task in tasks
-                if task.due_time is not None
-            ]) +
+            sum(lateness_terms) +
             sum([
                 nj_tasks[task]
-                for task in tasks
-            ])
+                for task in model_tasks
+            ]) + frozen_cost
         )
 
         # Specify that the goal is to minimize C_max (compress the schedule).
@@ -279,36 +843,440 @@ def numberjack_scheduler(tasks, upper_bound=500,
     else:
         model.add([
             nj_tasks[task] + task.duration < task.due_time
-            for task in tasks
+            for task in model_tasks
             if task.due_time is not None
         ])
 
+    observer.phase_ended("constraints")
+
+    observer.phase_started("bounds")
+    bounds = lower_bounds(tasks, lower_bound=lower_bound)
+    observer.phase_ended("bounds")
+
+    def read_solution():
+        return {
+            task: (nj_tasks[task].get_value(), {
+                resource: nj_resource.get_value()
+                for resource, nj_resource in nj_taskresources[task].items()
+            })
+            for task in model_tasks
+        }
+
+    build_end_time = time.time()
+    observer.phase_started("load")
     solver = model.load(solver_method)
     solver.setVerbosity(verbose_solver)
     solver.setTimeLimit(time_limit)
     solver.setRandomized(randomization)
-    result = solver.solve()
+    if heuristic is not None:
+        solver.setHeuristic(*heuristic)
+    if random_seed is not None:
+        solver.setRandomSeed(random_seed)
+    observer.phase_ended("load")
+    load_end_time = time.time()
+    observer.phase_started("solve")
+    # Only the solutions better than the warm-start schedule are reported.
+    best_cost = None if incumbent is None else incumbent_cost
+    if stop_search:
+        result, solution, status = False, None, "stopped"
+    elif ((gap_limit is None) and (on_solution is None)) or not optimize:
+        result = solver.solve()
+        solution = read_solution() if result else None
+        if result and (on_solution is not None) and (
+                (best_cost is None) or
+                (schedule_cost(solution) + frozen_cost < best_cost)):
+            on_solution(solution, schedule_cost(solution) + frozen_cost,
+                        time.time() - build_start_time)
+        if not result:
+            status = "infeasible" if solver.is_unsat() else "time_limit"
+        elif not optimize:
+            status = "satisfied"
+        else:
+            status = "optimal" if solver.is_opt() else "time_limit"
+    else:
+        # Get the improving solutions one by one and stop when the last one
+        # is close enough to the lower bound, or when asked by on_solution.
+        if solver_method == "Mistral":
+            # Mistral only starts the clock of its time limit in solve(), or
+            # when the search is reset.
+            solver.solver.reset(False)
+        solver.startNewSearch()
+        solution = None
+        status = "time_limit"
+        while (time.time() - load_end_time) < time_limit:
+            search_result = solver.getNextSolution()
+            if search_result != nj.SAT:
+                if search_result == nj.UNSAT:
+                    # No better solution: the search is complete.
+                    status = "infeasible" if solution is None else "optimal"
+                break
+            solution = read_solution()
+            cost = schedule_cost(solution) + frozen_cost
+            if (best_cost is not None) and (cost >= best_cost):
+                continue
+            best_cost = cost
+            if on_solution is not None:
+                if on_solution(solution, cost,
+                               time.time() - build_start_time):
+                    status = "stopped"
+                    break
+            if ((gap_limit is not None) and
+                    (optimality_gap(cost, bounds["cost"]) <= gap_limit)):
+                status = "stopped"
+                break
+        result = solution is not None
+    observer.phase_ended("solve")
+    if (incumbent is not None) and result and (
+            schedule_cost(solution) + frozen_cost >= incumbent_cost):
+        # The solver found nothing better than the warm-start schedule.
+        result = False
+    if (status == "infeasible") and (incumbent is not None):
+        status = "feasible"
+    stats.update(
+        status=status,
+        n_tasks=len(model_tasks),
+        n_frozen_tasks=len(frozen_tasks),
+        n_precedences=len(precedences),
+        n_symmetry_constraints=n_symmetry_constraints,
+        n_variables=len(getattr(model, "variables", ())),
+        n_constraints=len(getattr(model, "constraints", ())),
+        n_disjunctions=n_disjunctions,
+        model_build_time=build_end_time - build_start_time,
+        solver_load_time=load_end_time - build_end_time,
+        solve_time=time.time() - load_end_time,
+        nodes=solver.getNodes(),
+        backtracks=solver.getBacktracks(),
+        fails=solver.getFailures(),
+        propagations=solver.getPropags(),
+        lower_bounds=bounds
+    )
+    if incumbent is not None:
+        stats.update(warm_start_cost=incumbent_cost,
+                     improved_warm_start=result is not False)
 
     if result is False:
-        raise ValueError("No solution found by the schedule optimizer !")
+        if incumbent is None:
+            raise NoSolutionError(
+                "No solution found by the schedule optimizer !",
+                report=SolveReport.from_stats(stats))
+        solution = incumbent
 
-    for task in tasks:
-        nj_task = nj_tasks[task]
-        start = nj_task.get_value()
-        resources = {resource: nj_taskresources[task][resource].get_value()
-                     for resource in task.resources}
+    observer.phase_started("write_back")
+    # The slots of the cumulative resources are computed before any task is
+    # modified, so that the tasks are left untouched if this fails.
+    colourings = {}
+    if result is not False:
+        for resource, resource_tasks in resources_tasks.items():
+            if is_cumulative(resource):
+                starts = {task: solution[task][0] for task in resource_tasks}
+                starts.update((task, task.scheduled_start)
+                              for task in resources_frozen_tasks[resource])
+                try:
+                    colourings[resource] = slots_by_colouring(starts,
+                                                              resource)
+                except NoSolutionError:
+                    # The slots of the scheduled tasks leave no free slot to
+                    # some task: all slots of the resource are re-assigned.
+                    colourings[resource] = slots_by_colouring(
+                        starts, resource, keep_slots=False)
+    for task, (start, resources) in solution.items():
+        # The solution's dicts may have been passed to on_solution.
+        resources = dict(resources)
+        if task.scheduled_resources is not None:
+            # Keep the slots imposed on cumulative resources.
+            for resource, slot in task.scheduled_resources.items():
+                resources.setdefault(resource, slot)
         task.scheduled_start = start
         task.scheduled_resources = resources
+    for resource, slots in colourings.items():
+        for task, slot in slots.items():
+            # (the dicts of frozen tasks may be shared with other tasks)
+            task.scheduled_resources = dict(task.scheduled_resources or {})
+            task.scheduled_resources[resource] = slot
+    observer.phase_ended("write_back")
 
-
+    cost = schedule_cost(tasks)
+    stats.update(cost=cost, gap=0.0 if status == "optimal" else
+                 optimality_gap(cost, bounds["cost"]))
 
     return tasks
 
 
+def schedule_cost(schedule):
+    """Return the cost minimized by ``numberjack_scheduler`` for a schedule.
+
+    The cost is the sum of the tasks delays past their due times (weighted by
+    1000 times the tasks priorities) plus the sum of the tasks start times.
+
+    Parameters
+    ----------
+
+    schedule
+      Either a list of scheduled tasks, or a dict ``{task: (start, slots)}``
+      as returned by ``greedy_schedule``.
+
+    """
+    if not isinstance(schedule, dict):
+        schedule = {task: (task.scheduled_start, task.scheduled_resources)
+                    for task in schedule}
+    return sum(
+        start + (0 if task.due_time is None else
+                 1000 * task.priority *
+                 max(0, start + task.duration - task.due_time))
+        for task, (start, slots) in schedule.items()
+    )
+
+
+def independent_components(tasks):
+    """Split the tasks into groups which can be scheduled independently.
+
+    Two unscheduled tasks are in the same group if they share a resource
+    (unless its capacity is 'inf') or if one follows the other, directly or
+    through other tasks of the group. Scheduled tasks whose slots are all
+    known can't be moved: they are added to every group of tasks with which
+    they share a resource or a dependency (and are otherwise left out).
+    Scheduled tasks with unknown slots are treated as unscheduled tasks.
+
+    Returns a list of lists of tasks, in the order of the provided tasks.
+    """
+
+    def is_fixed(task):
+        return (task.scheduled_start is not None) and all(
+            resource in (task.scheduled_resources or {})
+            for resource in task.resources)
+
+    tasks_set = set(tasks)
+    parents = {task: task for task in tasks if not is_fixed(task)}
+
+    def find(task):
+        while parents[task] is not task:
+            parents[task] = parents[parents[task]]
+            task = parents[task]
+        return task
+
+    def union(task, other_task):
+        parents[find(task)] = find(other_task)
+
+    resources_first_tasks = {}
+    for task in parents:
+        for resource in task.resources:
+            if resource.capacity == 'inf':
+                continue
+            if resource in resources_first_tasks:
+                union(task, resources_first_tasks[resource])
+            else:
+                resources_first_tasks[resource] = task
+        for parent_task in task.follows:
+            if parent_task in parents:
+                union(task, parent_task)
+
+    components = OrderedDict()
+    for task in tasks:
+        if task in parents:
+            components.setdefault(find(task), []).append(task)
+    fixed_tasks_roots = {}
+    for task in tasks:
+        if task in parents:
+            continue
+        linked_tasks = [
+            resources_first_tasks[resource] for resource in task.resources
+            if resource in resources_first_tasks
+        ] + [
+            other_task for other_task in task.follows
+            if other_task in parents
+        ]
+        fixed_tasks_roots[task] = set(find(t) for t in linked_tasks)
+    for task in tasks:
+        if task not in parents:
+            continue
+        for parent_task in task.follows:
+            if (parent_task in tasks_set) and (parent_task not in parents):
+                fixed_tasks_roots[parent_task].add(find(task))
+    for task, roots in fixed_tasks_roots.items():
+        for root in roots:
+            components[root].append(task)
+    return list(components.values())
+
+
+def overlapping_pairs(intervals):
+    """Return the pairs ``(i, j)`` of indices of overlapping intervals.
+
+    The intervals are ``(start, end)`` tuples (intervals which only touch
+    don't overlap). They are swept by increasing start, so the computation
+    time grows with the number of overlapping pairs, not with the number of
+    pairs of intervals.
+    """
+    pairs = []
+    running = []
+    for i in sorted(range(len(intervals)), key=lambda i: intervals[i]):
+        start, end = intervals[i]
+        while running and (running[0][0] <= start):
+            heapq.heappop(running)
+        pairs.extend((j, i) for (other_end, j) in running)
+        heapq.heappush(running, (end, i))
+    return pairs
+
+
+def slots_by_colouring(starts, resource, keep_slots=True):
+    """Compute slots of a multi-slot resource for tasks with known starts.
+
+    The tasks are visited by increasing start time and each one gets the
+    lowest slot that is free over its whole duration (greedy colouring of the
+    interval graph). This never uses more slots than the maximal number of
+    tasks running at the same time, unless some tasks already have a slot in
+    their ``scheduled_resources``: these slots are kept (if ``keep_slots`` is
+    True), and other tasks may then find no free slot.
+
+    Parameters
+    ----------
+
+    starts
+      A dict ``{task: start}`` of the tasks using the resource.
+
+    resource
+      The Resource whose slots are assigned.
+
+    keep_slots
+      If False, the slots in the tasks' ``scheduled_resources`` are ignored
+      and all tasks get a new slot.
+
+    Returns
+    -------
+
+    slots
+      A dict ``{task: slot}`` for the tasks which had no slot of the resource
+      (all tasks if ``keep_slots`` is False). A ``NoSolutionError`` is raised
+      if some task gets no free slot.
+
+    """
+    fixed_intervals = defaultdict(list)
+    free_tasks = []
+    for task, start in starts.items():
+        slot = (task.scheduled_resources or {}).get(resource, None)
+        if (slot is None) or not keep_slots:
+            free_tasks.append(task)
+        else:
+            fixed_intervals[slot].append((start, start + task.duration))
+    for intervals in fixed_intervals.values():
+        intervals.sort()
+    fixed_starts = {
+        slot: [start for (start, end) in intervals]
+        for slot, intervals in fixed_intervals.items()
+    }
+
+    def overlaps_fixed_task(slot, start, end):
+        if slot not in fixed_intervals:
+            return False
+        index = bisect_left(fixed_starts[slot], end) - 1
+        return (index >= 0) and (fixed_intervals[slot][index][1] > start)
+
+    slots = {}
+    slots_free_from = {}
+    for task in sorted(free_tasks, key=lambda t: starts[t]):
+        start = starts[task]
+        end = start + task.duration
+        for slot in range(1, resource.capacity + 1):
+            if ((slots_free_from.get(slot, start) <= start) and
+                    not overlaps_fixed_task(slot, start, end)):
+                break
+        else:
+            raise NoSolutionError("No free slot of %s for task %s at time %s"
+                                  % (resource.name, task.name, start))
+        slots_free_from[slot] = end
+        slots[task] = slot
+    return slots
+
+
+def assign_slots_by_colouring(tasks, resource):
+    """Assign slots of a multi-slot resource to tasks with known start times.
+
+    See ``slots_by_colouring``. Slots already present in the tasks'
+    ``scheduled_resources`` are kept. The tasks are modified in place, and
+    only if all tasks got a slot.
+
+    Parameters
+    ----------
+
+    tasks
+      List of tasks using the resource, with a ``scheduled_start`` set.
+
+    resource
+      The Resource whose slots are assigned.
+
+    """
+    slots = slots_by_colouring({task: task.scheduled_start for task in tasks},
+                               resource)
+    for task, slot in slots.items():
+        if task.scheduled_resources is None:
+            task.scheduled_resources = {}
+        task.scheduled_resources[resource] = slot
+
+
 def schedule_processes_series(processes, est_process_duration=5000,
                               time_limit=20, verbose_solver=False,
                               time_limit_step=0, scheduled_tasks=(),
-                              n_trials=2, logger=None):
+                              n_trials=2, logger=None,
+                              capacity_model="slots",
+                              solver_method="Mistral", warm_start=False,
+                              parallel_trials=False,
+                              first_success_patience=0,
+                              rolling_horizon=False, observer=None):
+    """Schedule the processes one after the other, as compactly as possible.
+
+    At each step, the tasks of a new process are scheduled with
+    ``numberjack_scheduler`` around the tasks of the previous processes, which
+    are not moved anymore. The symmetries of ``numberjack_scheduler``'s
+    ``break_symmetries`` don't apply here: each step has a single process to
+    schedule, and the slots of its resources are already taken by the
+    previous processes.
+
+    Parameters
+    ----------
+
+    processes
+      A list of processes, each process being a list of tasks.
+
+    est_process_duration
+      Estimated duration of one process, used to set the horizon of each
+      step. If "auto", the horizon of each step is computed automatically
+      (see ``numberjack_scheduler``'s ``upper_bound``).
+
+    time_limit
+      Time limit in seconds of each solver run.
+
+    time_limit_step
+      When a step fails, it is retried (up to ``n_trials`` times) with a time
+      limit increased by this amount at each trial.
+
+    scheduled_tasks
+      List of pre-scheduled tasks (e.g. breaks) which will be taken into
+      account (copies of these tasks are used).
+
+    parallel_trials
+      If True, the ``n_trials`` trials of each step are launched at the same
+      time in worker processes (each with its own random seed and a time
+      limit of ``time_limit``), and the best schedule found is kept.
+
+    first_success_patience
+      When ``parallel_trials`` is True, number of seconds to wait for better
+      schedules from the other trials after the first trial finding a
+      schedule has returned (0 means the first schedule found is accepted).
+
+    rolling_horizon
+      If True, the tasks of the previous processes are not solver variables
+      anymore but frozen intervals, and those ending before the current
+      scheduling window are left out (see ``numberjack_scheduler``'s
+      ``freeze_scheduled``), so that the size of each step's model does not
+      grow with the number of processes already scheduled.
+
+    observer
+      Optional ``profiling.SchedulerObserver`` notified of each step of the
+      series ("series_step" phases) and passed to ``numberjack_scheduler``
+      (but not to the parallel trials, which run in other processes).
+
+    Other parameters are passed to ``numberjack_scheduler``.
+
+    """
     lower_bound = None
     process_duration = upper_bound = est_process_duration
 
@@ -319,11 +1287,36 @@ def schedule_processes_series(processes, est_process_duration=5000,
             upper_bound=upper_bound,
             lower_bound=lower_bound,
             time_limit=time_limit,
-            solver_method="Mistral",
+            solver_method=solver_method,
             randomization=randomization,
-            verbose_solver=verbose_solver
+            verbose_solver=verbose_solver,
+            capacity_model=capacity_model,
+            warm_start=warm_start,
+            freeze_scheduled=rolling_horizon,
+            observer=observer
         )
 
+    def schedule_tasks_with_parallel_trials(tasks, upper_bound, lower_bound):
+        from .parallel import portfolio_scheduler
+        portfolio_scheduler(
+            tasks,
+            configurations=[
+                dict(randomization=(trial > 0), random_seed=trial)
+                for trial in range(n_trials)
+            ],
+            first_success_patience=first_success_patience,
+            upper_bound=upper_bound,
+            lower_bound=lower_bound,
+            time_limit=time_limit,
+            solver_method=solver_method,
+            verbose_solver=verbose_solver,
+            capacity_model=capacity_model,
+            warm_start=warm_start,
+            freeze_scheduled=rolling_horizon
+        )
+
+    if observer is None:
+        observer = SchedulerObserver()
     considered_tasks = [copy(t) for t in scheduled_tasks]
     schedule_tasks(list(copy(processes[0])) + considered_tasks,
                    upper_bound, lower_bound, time_limit,
@@ -333,23 +1326,38 @@ def schedule_processes_series(processes, est_process_duration=5000,
     if logger is not None:
         iterator = logger.iter_bar(process=iterator)
     for i, process in iterator:
-        new_tasks = copy(process)
-        new_processes.append(new_tasks)
-        considered_tasks += new_tasks
-        for trial in range(n_trials):
+        observer.phase_started("series_step")
+        try:
+            new_tasks = copy(process)
+            new_processes.append(new_tasks)
+            considered_tasks += new_tasks
+            if parallel_trials:
+                trials = [None]
+            else:
+                trials = [time_limit + time_limit_step * trial
+                          for trial in range(n_trials)]
+            for trial_time_limit in trials:
 
-            try:
-                schedule_tasks(considered_tasks, upper_bound, lower_bound,
-                               time_limit + time_limit_step * trial,
-                               randomization=0)
-                lower_bound = min([t.scheduled_start for t in new_tasks])
-                latest = max([t.scheduled_end for t in new_tasks])
-                process_duration = min(process_duration, latest - lower_bound)
-                upper_bound = latest + est_process_duration
-                break
-            except ValueError as e:
-                pass
-        assert all([(t.scheduled_resources is not None)
-                    for t in considered_tasks])
+                try:
+                    if parallel_trials:
+                        schedule_tasks_with_parallel_trials(
+                            considered_tasks, upper_bound, lower_bound)
+                    else:
+                        schedule_tasks(considered_tasks, upper_bound,
+                                       lower_bound, trial_time_limit,
+                                       randomization=0)
+                    lower_bound = min([t.scheduled_start for t in new_tasks])
+                    latest = max([t.scheduled_end for t in new_tasks])
+                    if est_process_duration != "auto":
+                        process_duration = min(process_duration,
+                                               latest - lower_bound)
+                        upper_bound = latest + est_process_duration
+                    break
+                except ValueError as e:
+                    pass
+            assert all([(t.scheduled_resources is not None)
+                        for t in considered_tasks])
+        finally:
+            observer.phase_ended("series_step")
 
     return new_processes
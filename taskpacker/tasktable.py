@@ -0,0 +1,240 @@
+"""Columnar (NumPy arrays) representation of a set of tasks.
+
+A ``TaskTable`` stores one array per task attribute, which makes metrics and
+checks over large schedules fast to compute with NumPy instead of iterating
+over Task objects. The resources used by the tasks and the tasks
+dependencies are stored in compressed sparse row (CSR) form: the resources
+of task ``i`` are ``resource_indices[resource_indptr[i]:resource_indptr[i +
+1]]``, and similarly for the tasks it follows.
+"""
+
+import numpy as np
+
+from .taskpacker import Task
+
+
+def _to_float_array(values):
+    return np.array([np.nan if value is None else value for value in values],
+                    dtype=float)
+
+
+def _to_values(array, integer):
+    return [None if np.isnan(value) else
+            (int(value) if integer else float(value))
+            for value in array]
+
+
+TIME_COLUMNS = ["durations", "starts", "due_times", "max_waits"]
+
+
+def _csr(lists):
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(elements) for elements in lists])
+    indices = np.array([e for elements in lists for e in elements],
+                       dtype=np.int64)
+    return indptr, indices
+
+
+class TaskTable:
+    """Struct-of-arrays representation of a list of tasks.
+
+    Use ``TaskTable.from_tasks(tasks)`` to create a table, and
+    ``table.to_tasks()`` to get Task objects back.
+
+    Parameters
+    ----------
+
+    names, colors
+      Object arrays of the tasks names and colors.
+
+    durations, starts, due_times, max_waits
+      Float arrays of the tasks times, with NaN for None (e.g. for the starts
+      of unscheduled tasks).
+
+    priorities
+      Float array of the tasks priorities.
+
+    resources
+      List of the resources used by the tasks.
+
+    resource_indptr, resource_indices, slots
+      CSR representation of the (task x resource) incidence matrix:
+      the resources used by task ``i`` are at positions
+      ``resource_indptr[i]:resource_indptr[i + 1]`` in ``resource_indices``
+      (indices in ``resources``), and ``slots`` gives at the same positions
+      the slot of the resource used by the task (0 if unknown).
+
+    has_slots
+      Boolean array telling which tasks have ``scheduled_resources``.
+
+    follows_indptr, follows_indices
+      CSR representation of the dependencies: the task ``i`` follows the
+      tasks ``follows_indices[follows_indptr[i]:follows_indptr[i + 1]]``.
+
+    integer_times
+      Dict ``{column: bool}`` telling, for each time column ("durations",
+      "starts", "due_times", "max_waits"), whether ``to_tasks`` converts its
+      values back to integers (missing columns count as True). A boolean
+      applies to all columns.
+
+    """
+
+    def __init__(self, names, durations, starts, due_times, max_waits,
+                 priorities, colors, resources, resource_indptr,
+                 resource_indices, slots, has_slots, follows_indptr,
+                 follows_indices, integer_times=True):
+        self.names = names
+        self.durations = durations
+        self.starts = starts
+        self.due_times = due_times
+        self.max_waits = max_waits
+        self.priorities = priorities
+        self.colors = colors
+        self.resources = resources
+        self.resource_indptr = resource_indptr
+        self.resource_indices = resource_indices
+        self.slots = slots
+        self.has_slots = has_slots
+        self.follows_indptr = follows_indptr
+        self.follows_indices = follows_indices
+        if isinstance(integer_times, dict):
+            integer_times = {column: bool(integer_times.get(column, True))
+                             for column in TIME_COLUMNS}
+        else:
+            integer_times = {column: bool(integer_times)
+                             for column in TIME_COLUMNS}
+        self.integer_times = integer_times
+
+    @staticmethod
+    def from_tasks(tasks, include_parents=False):
+        """Create a table from a list of tasks.
+
+        If ``include_parents`` is False, all tasks followed by the given tasks
+        must be in the list, else they are added at the end of the table.
+        """
+        tasks = list(tasks)
+        index = {task: i for i, task in enumerate(tasks)}
+        if include_parents:
+            for task in tasks:
+                for parent in task.follows:
+                    if parent not in index:
+                        index[parent] = len(tasks)
+                        tasks.append(parent)
+        resources = []
+        resources_index = {}
+        tasks_resources, tasks_slots, tasks_parents = [], [], []
+        for task in tasks:
+            for resource in task.resources:
+                if resource not in resources_index:
+                    resources_index[resource] = len(resources)
+                    resources.append(resource)
+            tasks_resources.append([resources_index[resource]
+                                    for resource in task.resources])
+            slots = task.scheduled_resources or {}
+            tasks_slots.append([slots.get(resource, 0)
+                                for resource in task.resources])
+            for parent in task.follows:
+                if parent not in index:
+                    raise ValueError("Task %s follows task %s, which is not "
+                                     "in the tasks list." % (task.name,
+                                                             parent.name))
+            tasks_parents.append([index[parent] for parent in task.follows])
+        resource_indptr, resource_indices = _csr(tasks_resources)
+        follows_indptr, follows_indices = _csr(tasks_parents)
+        columns = dict(
+            durations=[task.duration for task in tasks],
+            starts=[task.scheduled_start for task in tasks],
+            due_times=[task.due_time for task in tasks],
+            max_waits=[task.max_wait for task in tasks]
+        )
+        return TaskTable(
+            names=np.array([task.name for task in tasks], dtype=object),
+            durations=_to_float_array(columns["durations"]),
+            starts=_to_float_array(columns["starts"]),
+            due_times=_to_float_array(columns["due_times"]),
+            max_waits=_to_float_array(columns["max_waits"]),
+            priorities=np.array([task.priority for task in tasks],
+                                dtype=float),
+            # (the extra None keeps RGB(A) tuples as single objects)
+            colors=np.array([task.color for task in tasks] + [None],
+                            dtype=object)[:-1],
+            resources=resources,
+            resource_indptr=resource_indptr,
+            resource_indices=resource_indices,
+            slots=np.array([slot for slots in tasks_slots for slot in slots],
+                           dtype=np.int64),
+            has_slots=np.array([task.scheduled_resources is not None
+                                for task in tasks], dtype=bool),
+            follows_indptr=follows_indptr,
+            follows_indices=follows_indices,
+            integer_times={
+                column: all(isinstance(value, (int, np.integer))
+                            for value in values if value is not None)
+                for column, values in columns.items()
+            }
+        )
+
+    def to_tasks(self):
+        """Return a list of new Task objects with the data of the table."""
+        durations, starts, due_times, max_waits = [
+            _to_values(getattr(self, column), self.integer_times[column])
+            for column in TIME_COLUMNS
+        ]
+        tasks = []
+        for i in range(len(self)):
+            resources_range = slice(self.resource_indptr[i],
+                                    self.resource_indptr[i + 1])
+            resources = [self.resources[r]
+                         for r in self.resource_indices[resources_range]]
+            scheduled_resources = None
+            if self.has_slots[i]:
+                scheduled_resources = {
+                    resource: int(slot)
+                    for resource, slot in zip(resources,
+                                              self.slots[resources_range])
+                    if slot != 0
+                }
+            priority = float(self.priorities[i])
+            tasks.append(Task(
+                str(self.names[i]), resources=resources,
+                duration=durations[i],
+                max_wait=max_waits[i], scheduled_start=starts[i],
+                scheduled_resources=scheduled_resources,
+                priority=int(priority) if priority.is_integer() else priority,
+                due_time=due_times[i], color=self.colors[i]))
+        for i, task in enumerate(tasks):
+            task.follows = [tasks[parent] for parent in self.parents(i)]
+        return tasks
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def ends(self):
+        """Array of the end times of the tasks (NaN if not scheduled)."""
+        return self.starts + self.durations
+
+    @property
+    def tasks_indices(self):
+        """Array giving, for each entry of ``resource_indices``, the index of
+        the task (the row of the incidence matrix)."""
+        return np.repeat(np.arange(len(self)),
+                         np.diff(self.resource_indptr))
+
+    def parents(self, i):
+        """Return the indices of the tasks followed by task ``i``."""
+        return self.follows_indices[self.follows_indptr[i]:
+                                    self.follows_indptr[i + 1]]
+
+    def resource_tasks(self, resource_index):
+        """Return the indices of the tasks using a resource, and the slots
+        they use."""
+        entries = np.flatnonzero(self.resource_indices == resource_index)
+        return self.tasks_indices[entries], self.slots[entries]
+
+    def incidence_matrix(self):
+        """Return the dense (n_tasks x n_resources) boolean matrix telling
+        which task uses which resource."""
+        matrix = np.zeros((len(self), len(self.resources)), dtype=bool)
+        matrix[self.tasks_indices, self.resource_indices] = True
+        return matrix
@@ -0,0 +1,101 @@
+"""Templates of processes, to create many copies of a same process."""
+
+from .taskpacker import Task
+
+
+class ProcessTemplate:
+    """A process (list of tasks) from which independent copies can be made.
+
+    Parameters
+    ----------
+
+    tasks
+      The tasks of the process. Tasks followed by these tasks but not in the
+      list (e.g. pre-scheduled tasks) are followed by all the copies.
+
+    Examples
+    --------
+
+    >>> template = ProcessTemplate.from_spreadsheet(
+    >>>     "dna_assembly.xls", sheetname="process")
+    >>> processes = template.instantiate_many(20, "WU%d_")
+
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+
+    @staticmethod
+    def from_spreadsheet(spreadsheet_path, **kwargs):
+        """Read a template from a spreadsheet (read once).
+
+        The parameters are the same as for ``io.tasks_from_spreadsheet``,
+        except ``tasks_color`` and ``task_name_prefix`` which are given for
+        each copy of the process.
+        """
+        from .io import tasks_from_spreadsheet
+        return ProcessTemplate(tasks_from_spreadsheet(
+            spreadsheet_path, tasks_color=None, **kwargs))
+
+    def instantiate(self, task_name_prefix="", tasks_color="blue"):
+        """Return a new copy of the process, as a list of new tasks.
+
+        The new tasks share the resources of the template tasks and follow
+        the new copies of the template tasks they follow.
+
+        Parameters
+        ----------
+
+        task_name_prefix
+          Prefix added to the names of the new tasks (e.g. "WU1_").
+
+        tasks_color
+          Color of the new tasks whose template task has no color.
+
+        """
+        new_tasks = {}
+        for task in self.tasks:
+            new_tasks[task] = Task(
+                task_name_prefix + task.name,
+                resources=task.resources,
+                duration=task.duration,
+                follows=task.follows,
+                max_wait=task.max_wait,
+                scheduled_start=task.scheduled_start,
+                scheduled_resources=(
+                    None if task.scheduled_resources is None
+                    else dict(task.scheduled_resources)),
+                priority=task.priority,
+                due_time=task.due_time,
+                color=tasks_color if task.color is None else task.color
+            )
+        for new_task in new_tasks.values():
+            new_task.follows = [new_tasks.get(parent, parent)
+                                for parent in new_task.follows]
+        return list(new_tasks.values())
+
+    def instantiate_many(self, n_copies, task_name_prefix="WU%d_",
+                         tasks_colors=None):
+        """Return a list of ``n_copies`` new copies of the process.
+
+        Parameters
+        ----------
+
+        n_copies
+          Number of copies.
+
+        task_name_prefix
+          Prefix of the tasks names, in which "%d" is replaced by the copy
+          number (starting at 1).
+
+        tasks_colors
+          Optional iterable of colors, one for each copy.
+
+        """
+        if tasks_colors is None:
+            tasks_colors = ["blue"] * n_copies
+        return [
+            self.instantiate(task_name_prefix=task_name_prefix % (i + 1),
+                             tasks_color=color)
+            for i, color in zip(range(n_copies), tasks_colors)
+        ]
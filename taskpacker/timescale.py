@@ -0,0 +1,111 @@
+"""Changing the time unit of scheduling problems.
+
+Durations are often all multiples of some time step (e.g. 5 or 15 minutes).
+Expressing all times in this bigger unit gives an equivalent problem with
+much smaller domains for the solver.
+"""
+
+from copy import copy
+from math import gcd
+
+from .bounds import topological_sort
+
+
+def _is_integer(value):
+    try:
+        return float(value).is_integer()
+    except (TypeError, ValueError):
+        return False
+
+
+def time_granularity(tasks, other_times=()):
+    """Return the largest time step dividing all times of the tasks.
+
+    The times considered are the durations, ``max_wait``, ``due_time`` and
+    ``scheduled_start`` of the tasks and of the tasks they follow, and the
+    ``other_times`` of the problem (e.g. its lower and upper bounds, None
+    values being ignored). Returns 1 if any of these times is not an
+    integer.
+    """
+    times = set(value for value in other_times if value is not None)
+    seen_tasks = set()
+    tasks_to_visit = list(tasks)
+    while tasks_to_visit:
+        task = tasks_to_visit.pop()
+        if task in seen_tasks:
+            continue
+        seen_tasks.add(task)
+        tasks_to_visit.extend(task.follows)
+        for value in (task.duration, task.max_wait, task.due_time,
+                      task.scheduled_start):
+            if value is not None:
+                times.add(value)
+    result = 0
+    for value in times:
+        if not _is_integer(value):
+            return 1
+        result = gcd(result, int(value))
+    return max(1, result)
+
+
+def scale_tasks(tasks, factor, exact=True):
+    """Return copies of the tasks with all times divided by ``factor``.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of tasks. Tasks followed by these tasks are also copied (the
+      ``follows`` of the copies point to copies).
+
+    factor
+      The new time unit, in units of the tasks' times.
+
+    exact
+      If True, all times must be multiples of ``factor`` (see
+      ``time_granularity``) and the problem obtained is equivalent to the
+      original one. If False, the times are rounded to produce a coarser
+      problem: durations are rounded up, ``max_wait`` and ``due_time`` are
+      rounded down, and scheduled tasks keep covering their original
+      interval.
+
+    Returns
+    -------
+
+    (scaled_tasks, copies)
+      The list of copies of the given tasks, and a dict
+      ``{task: copy}`` covering all copied tasks.
+    """
+
+    def round_down(value):
+        return None if value is None else int(value // factor)
+
+    def round_up(value):
+        return None if value is None else int(-(-value // factor))
+
+    visited = set()
+    all_tasks = []
+    tasks_to_visit = list(tasks)
+    while tasks_to_visit:
+        task = tasks_to_visit.pop()
+        if task not in visited:
+            visited.add(task)
+            all_tasks.append(task)
+            tasks_to_visit.extend(task.follows)
+
+    copies = {}
+    for task in topological_sort(all_tasks):
+        new_task = copy(task)
+        new_task.scheduled_start = round_down(task.scheduled_start)
+        if exact or (task.scheduled_start is None):
+            new_task.duration = round_up(task.duration)
+        else:
+            new_task.duration = (round_up(task.scheduled_end) -
+                                 new_task.scheduled_start)
+        if task.scheduled_resources is not None:
+            new_task.scheduled_resources = dict(task.scheduled_resources)
+        new_task.max_wait = round_down(task.max_wait)
+        new_task.due_time = round_down(task.due_time)
+        new_task.follows = [copies[parent] for parent in task.follows]
+        copies[task] = new_task
+    return [copies[task] for task in tasks], copies
@@ -0,0 +1,203 @@
+"""Checking that a schedule respects all the constraints of its tasks.
+
+All checks are vectorized with NumPy over a ``TaskTable`` and use sorting
+and sweeping, so that schedules of 100,000+ tasks are checked in well under a
+second (once the table is built).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .tasktable import TaskTable
+
+Violation = namedtuple("Violation", ["kind", "tasks", "resource", "time",
+                                     "message"])
+Violation.__doc__ = """A constraint violated by a schedule.
+
+kind
+  One of "unscheduled", "missing_slot", "invalid_slot", "slot_overlap",
+  "capacity", "precedence", "max_wait", "due_time".
+
+tasks
+  Tuple of the names of the tasks involved.
+
+resource
+  Name of the resource involved, or None.
+
+time
+  Time at which the violation occurs.
+
+message
+  Human-readable description of the violation.
+"""
+
+
+def _running_max_owner(values):
+    """Return the running maximum of the values, and the index of the
+    element reaching this maximum, at each position."""
+    running_max = np.maximum.accumulate(values)
+    is_record = values == running_max
+    owner = np.maximum.accumulate(np.where(is_record,
+                                           np.arange(len(values)), 0))
+    return running_max, owner
+
+
+def validate_schedule(tasks, check_due_times=True):
+    """Return the list of the constraints violated by a schedule.
+
+    The following constraints are checked: all tasks are scheduled and have
+    valid slots for their resources (unless the resource has an 'inf'
+    capacity), no two tasks use the same slot of a resource at the same time,
+    no resource is used by more tasks than its capacity at any time, tasks
+    start after the tasks they follow end, and not more than their
+    ``max_wait`` after, and tasks end before their due time.
+
+    Parameters
+    ----------
+
+    tasks
+      A list of scheduled tasks, or a ``TaskTable``. Tasks followed by the
+      listed tasks are also checked.
+
+    check_due_times
+      If False, missed due times are not reported (they are not constraints
+      for ``numberjack_scheduler`` unless ``optimize`` is False).
+
+    Returns
+    -------
+
+    violations
+      A list of ``Violation`` (empty if the schedule is valid).
+
+    """
+    if isinstance(tasks, TaskTable):
+        table = tasks
+    else:
+        table = TaskTable.from_tasks(tasks, include_parents=True)
+    names = table.names
+    starts, ends = table.starts, table.ends
+    violations = []
+
+    unscheduled = np.flatnonzero(np.isnan(starts))
+    for i in unscheduled:
+        violations.append(Violation("unscheduled", (names[i],), None, None,
+                                    "Task %s is not scheduled" % names[i]))
+
+    # RESOURCES
+
+    capacities = np.array([np.inf if resource.capacity == 'inf'
+                           else resource.capacity
+                           for resource in table.resources], dtype=float)
+    resource_names = [resource.name for resource in table.resources]
+    entry_tasks = table.tasks_indices
+    entry_resources = table.resource_indices
+    entry_slots = table.slots
+    considered = (np.isfinite(capacities[entry_resources]) &
+                  ~np.isnan(starts[entry_tasks]))
+    entry_tasks = entry_tasks[considered]
+    entry_resources = entry_resources[considered]
+    entry_slots = entry_slots[considered]
+
+    for kind, wrong in [
+        ("missing_slot", entry_slots == 0),
+        ("invalid_slot", (entry_slots < 0) |
+                         (entry_slots > capacities[entry_resources]))
+    ]:
+        for entry in np.flatnonzero(wrong):
+            task, resource = entry_tasks[entry], entry_resources[entry]
+            violations.append(Violation(
+                kind, (names[task],), resource_names[resource],
+                float(starts[task]), "Task %s has slot %d of resource %s" %
+                (names[task], entry_slots[entry], resource_names[resource])))
+
+    # Slot overlaps: sort the tasks by (resource, slot, start) and compare
+    # each start with the latest end of the previous tasks in the same slot.
+    with_slot = entry_slots > 0
+    slot_tasks = entry_tasks[with_slot]
+    slot_resources = entry_resources[with_slot]
+    slot_slots = entry_slots[with_slot]
+    if len(slot_tasks) > 1:
+        order = np.lexsort((starts[slot_tasks], slot_slots, slot_resources))
+        slot_tasks = slot_tasks[order]
+        slot_resources = slot_resources[order]
+        slot_slots = slot_slots[order]
+        # Offset the times of each (resource, slot) group so that the running
+        # maximum of the ends doesn't carry over from a group to the next.
+        new_group = np.ones(len(slot_tasks), dtype=bool)
+        new_group[1:] = ((slot_resources[1:] != slot_resources[:-1]) |
+                         (slot_slots[1:] != slot_slots[:-1]))
+        group = np.cumsum(new_group)
+        time_min = np.nanmin(starts)
+        span = np.nanmax(ends) - time_min + 1
+        offsets = group * span - time_min
+        running_end, owner = _running_max_owner(ends[slot_tasks] + offsets)
+        overlaps = np.flatnonzero(
+            ~new_group[1:] &
+            (starts[slot_tasks[1:]] + offsets[1:] < running_end[:-1])) + 1
+        for position in overlaps:
+            task = slot_tasks[position]
+            other_task = slot_tasks[owner[position - 1]]
+            resource = resource_names[slot_resources[position]]
+            violations.append(Violation(
+                "slot_overlap", (names[other_task], names[task]), resource,
+                float(starts[task]),
+                "Tasks %s and %s overlap in slot %d of %s" %
+                (names[other_task], names[task], slot_slots[position],
+                 resource)))
+
+    # Capacity overruns: sweep over the starts and ends of the tasks of each
+    # resource, counting the tasks running (ends come before starts).
+    n_entries = len(entry_tasks)
+    if n_entries:
+        event_resources = np.concatenate([entry_resources, entry_resources])
+        event_times = np.concatenate([starts[entry_tasks], ends[entry_tasks]])
+        event_deltas = np.concatenate([np.ones(n_entries, dtype=int),
+                                       -np.ones(n_entries, dtype=int)])
+        event_tasks = np.concatenate([entry_tasks, entry_tasks])
+        order = np.lexsort((event_deltas, event_times, event_resources))
+        # Each resource's events sum to zero, so the running count is reset
+        # at each new resource.
+        running = np.cumsum(event_deltas[order])
+        over = running > capacities[event_resources[order]]
+        entering = over & ~np.concatenate([[False], over[:-1]])
+        for position in np.flatnonzero(entering):
+            event = order[position]
+            resource = resource_names[event_resources[event]]
+            violations.append(Violation(
+                "capacity", (names[event_tasks[event]],), resource,
+                float(event_times[event]),
+                "%d tasks use %s (capacity %d) at time %s" %
+                (running[position], resource,
+                 capacities[event_resources[event]], event_times[event])))
+
+    # PRECEDENCES AND MAX WAITS
+
+    children = np.repeat(np.arange(len(table)), np.diff(table.follows_indptr))
+    parents = table.follows_indices
+    with np.errstate(invalid="ignore"):
+        early = starts[children] < ends[parents]
+        late = starts[children] > ends[parents] + table.max_waits[children]
+    for kind, wrong in [("precedence", early), ("max_wait", late)]:
+        for edge in np.flatnonzero(wrong):
+            child, parent = children[edge], parents[edge]
+            message = (
+                "Task %s starts before the end of task %s" if
+                kind == "precedence" else
+                "Task %s starts more than max_wait after task %s ends"
+            ) % (names[child], names[parent])
+            violations.append(Violation(kind, (names[parent], names[child]),
+                                        None, float(starts[child]), message))
+
+    # DUE TIMES
+
+    if check_due_times:
+        with np.errstate(invalid="ignore"):
+            late_tasks = np.flatnonzero(ends > table.due_times)
+        for i in late_tasks:
+            violations.append(Violation(
+                "due_time", (names[i],), None, float(ends[i]),
+                "Task %s ends at %s, after its due time %s" %
+                (names[i], ends[i], table.due_times[i])))
+
+    return violations
@@ -5,6 +5,10 @@ That's because the project is still experimental and "expected behavior" is
 a very fluid concept at this time.
 """
 import os
+import pickle
+import threading
+import itertools as itt
+from copy import copy
 import matplotlib
 matplotlib.use('Agg')
 from taskpacker import (tasks_from_spreadsheet,
@@ -12,7 +16,11 @@ from taskpacker import (tasks_from_spreadsheet,
                         schedule_processes_series,
                         plot_tasks_dependency_graph,
                         plot_schedule, Task, Resource,
-                        numberjack_scheduler)
+                        numberjack_scheduler, improving_schedules,
+                        NoSolutionError)
+from taskpacker.taskpacker import schedule_cost
+from taskpacker.validation import validate_schedule
+from taskpacker.greedy import greedy_schedule
 
 import matplotlib.cm as cm
 
@@ -74,3 +82,225 @@ def test_alice_and_bob():
     all_tasks = [clean_scalpels, visit_plants, cook_hamsters, dice_hamsters,
                  feed_gremlins]
     scheduled_tasks = numberjack_scheduler(all_tasks)
+
+
+def test_alice_and_bob_cumulative():
+
+    alice = Resource("Alice", capacity=2)
+    bob = Resource("Bob", capacity=1)
+
+    visit_plants = Task("Visit the plants", resources=[alice], duration=60)
+    cook_hamsters = Task("Cook the hamsters", resources=[alice], duration=30)
+    water_plants = Task("Water the plants", resources=[alice], duration=20)
+    dice_hamsters = Task("Dice the hamsters", resources=[bob], duration=40,
+                         follows=[cook_hamsters])
+    feed_gremlins = Task("Feed the gremlins", resources=[alice, bob],
+                         duration=50, follows=[dice_hamsters])
+
+    all_tasks = [visit_plants, cook_hamsters, water_plants, dice_hamsters,
+                 feed_gremlins]
+    scheduled_tasks = numberjack_scheduler(all_tasks,
+                                           capacity_model="cumulative")
+    alice_tasks = [t for t in scheduled_tasks if alice in t.resources]
+    for task, other_task in itt.combinations(alice_tasks, 2):
+        if (task.scheduled_resources[alice] ==
+                other_task.scheduled_resources[alice]):
+            assert ((task.scheduled_end <= other_task.scheduled_start) or
+                    (other_task.scheduled_end <= task.scheduled_start))
+
+
+def test_cumulative_with_preset_slots():
+    # The scheduled tasks A and B are counted as running tasks of the oven.
+    oven = Resource("oven", capacity=2)
+    task_a = Task("A", resources=[oven], duration=10, scheduled_start=10,
+                  scheduled_resources={oven: 1})
+    task_b = Task("B", resources=[oven], duration=5, scheduled_start=0,
+                  scheduled_resources={oven: 2})
+    task_x = Task("X", resources=[oven], duration=9)
+    stats = {}
+    numberjack_scheduler([task_a, task_b, task_x], stats=stats,
+                         capacity_model="cumulative")
+    assert validate_schedule([task_a, task_b, task_x]) == []
+    # A and B can't overlap: only their pairs with X are constrained.
+    assert stats["n_disjunctions"] == {"oven": 2}
+
+
+def test_cumulative_reassigns_preset_slots():
+    # If A and B keep their slots, no slot is free for X over [3, 12).
+    oven, robot = Resource("oven", capacity=2), Resource("robot")
+    task_a = Task("A", resources=[oven], duration=10, scheduled_start=10,
+                  scheduled_resources={oven: 1})
+    task_b = Task("B", resources=[oven], duration=5, scheduled_start=0,
+                  scheduled_resources={oven: 2})
+    task_p = Task("P", resources=[robot], duration=3)
+    task_x = Task("X", resources=[oven], duration=9, follows=[task_p],
+                  max_wait=0)
+    tasks = [task_a, task_b, task_p, task_x]
+    stats = {}
+    numberjack_scheduler(tasks, stats=stats, capacity_model="cumulative")
+    assert stats["n_variables"] == 5  # (the tasks and the cost, no slots)
+    assert [task.scheduled_start for task in tasks] == [10, 0, 0, 3]
+    assert validate_schedule(tasks) == []
+
+
+def test_auto_horizon():
+    # The horizon is the end of a greedy schedule: back-to-back tasks in a
+    # slot and due times past the horizon must not make the model infeasible.
+    oven = Resource("oven", capacity=3)
+    tasks = [Task("T%d" % i, resources=[oven], duration=5 + (7 * i) % 11,
+                  due_time=30 + 5 * i) for i in range(9)]
+    greedy_end = max(start + task.duration for task, (start, slots)
+                     in greedy_schedule(tasks).items())
+    numberjack_scheduler(tasks, upper_bound="auto", time_limit=2,
+                         break_symmetries=True)
+    assert max(task.scheduled_end for task in tasks) <= greedy_end
+    assert validate_schedule(tasks, check_due_times=False) == []
+
+
+def test_warm_start():
+    alice = Resource("Alice", capacity=2)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10 + i)
+             for i in range(6)]
+    stats = {}
+    numberjack_scheduler(tasks, warm_start=True, stats=stats)
+    assert all(task.scheduled_start is not None for task in tasks)
+    assert stats["warm_start_cost"] >= schedule_cost(tasks)
+
+
+def test_warm_start_with_slotted_task():
+    resource = Resource("R0", capacity=2)
+    t1 = Task("T1", resources=[resource], duration=20, due_time=30)
+    t2 = Task("T2", resources=[resource], duration=5)
+    t3 = Task("T3", resources=[resource], duration=20, scheduled_start=30,
+              scheduled_resources={resource: 2})
+    t5 = Task("T5", resources=[resource], duration=20, follows=[t1],
+              max_wait=3)
+    tasks = [t1, t2, t3, t5]
+    stats = {}
+    numberjack_scheduler(tasks, warm_start=True, upper_bound=200,
+                         stats=stats)
+    assert validate_schedule(tasks) == []
+    assert stats["status"] == "optimal"
+    assert schedule_cost(tasks) == 50
+
+
+def test_warm_start_finds_the_optimum():
+    def make_tasks():
+        machine = Resource("R0", capacity=1)
+        t1 = Task("T1", resources=[machine], duration=10)
+        t2 = Task("T2", resources=[machine], duration=20, follows=[t1],
+                  max_wait=2)
+        return [Task("T0", resources=[machine], duration=20), t1, t2,
+                Task("T3", resources=[machine], duration=5),
+                Task("T4", resources=[machine], duration=10, due_time=34,
+                     follows=[t2], max_wait=2)]
+    costs = []
+    for warm_start in (False, True):
+        tasks = make_tasks()
+        stats = {}
+        numberjack_scheduler(tasks, warm_start=warm_start, upper_bound=200,
+                             stats=stats)
+        assert stats["status"] == "optimal"
+        costs.append(schedule_cost(tasks))
+    assert costs == [6125, 6125]
+
+
+def test_rolling_horizon():
+    robot = Resource("robot", capacity=1)
+    oven = Resource("oven", capacity=2)
+
+    def new_process(i):
+        load = Task("WU%d_load" % i, resources=[robot], duration=5)
+        bake = Task("WU%d_bake" % i, resources=[oven], duration=30,
+                    follows=[load], max_wait=2)
+        return [load, bake]
+
+    processes = [new_process(i) for i in range(6)]
+    new_processes = schedule_processes_series(
+        processes, est_process_duration=200, time_limit=2,
+        rolling_horizon=True)
+    bakes = sorted([p[1] for p in new_processes],
+                   key=lambda t: t.scheduled_start)
+    for task, other_task in itt.combinations(bakes, 2):
+        if (task.scheduled_resources[oven] ==
+                other_task.scheduled_resources[oven]):
+            assert task.scheduled_end <= other_task.scheduled_start
+
+
+def test_freeze_scheduled():
+    robot = Resource("robot", capacity=1)
+    oven = Resource("oven", capacity=2)
+
+    def new_process(i):
+        load = Task("WU%d_load" % i, resources=[robot], duration=5)
+        bake = Task("WU%d_bake" % i, resources=[oven], duration=30,
+                    follows=[load], max_wait=2)
+        return [load, bake]
+
+    first_tasks = new_process(0) + new_process(1)
+    numberjack_scheduler(first_tasks)
+    schedule = [(task.scheduled_start, dict(task.scheduled_resources))
+                for task in first_tasks]
+    new_tasks = new_process(2) + new_process(3)
+    stats = {}
+    numberjack_scheduler(first_tasks + new_tasks, freeze_scheduled=True,
+                         stats=stats)
+    assert (stats["n_tasks"], stats["n_frozen_tasks"]) == (4, 4)
+    assert [(task.scheduled_start, task.scheduled_resources)
+            for task in first_tasks] == schedule
+    assert validate_schedule(first_tasks + new_tasks) == []
+
+
+def test_solve_report():
+    alice, fridge = Resource("Alice"), Resource("fridge", capacity='inf')
+    tasks = [Task("T%d" % i, resources=[alice, fridge], duration=10 * i)
+             for i in range(1, 4)]
+    scheduled_tasks, report = numberjack_scheduler(tasks, return_report=True)
+    assert (report.status, report.cost) == ("optimal", 40)
+    assert report.stats["lower_bounds"]["makespan"] == 60
+    # The tasks can't all start at 0 on Alice: at best they start at 0, 10
+    # and 30 (shortest tasks first).
+    assert report.stats["lower_bounds"]["cost"] == 40
+    assert report.gap == 0
+    assert report.n_disjunctions == {"Alice": 3}
+    for task in tasks:
+        task.scheduled_start = task.scheduled_resources = None
+    try:
+        numberjack_scheduler(tasks, upper_bound=50)
+    except NoSolutionError as error:
+        assert error.report.status == "infeasible"
+        assert error.report.n_disjunctions == {"Alice": 3}
+    else:
+        raise AssertionError("The tasks can't end before time 50")
+
+
+def test_tasks_and_resources_identities():
+    alice, other_alice = Resource("Alice"), Resource("Alice", capacity=2)
+    assert (alice == other_alice) and (hash(alice) == hash(other_alice))
+    assert alice != Resource("Bob")
+    task = Task("Cook", resources=[alice], duration=10)
+    other_task = copy(task)
+    assert not hasattr(task, "__dict__")
+    assert isinstance(task.id, int) and (other_task.id == task.id)
+    assert Task("Cook", resources=[alice], duration=10).id != task.id
+    assert pickle.loads(pickle.dumps(task)).resources == [other_alice]
+
+
+def test_improving_schedules_yields_copies():
+    oven = Resource("oven", capacity=2)
+    tasks = [Task("T%d" % i, resources=[oven], duration=10 + i)
+             for i in range(4)]
+    solutions = list(improving_schedules(tasks, time_limit=2,
+                                         capacity_model="cumulative"))
+    # The write-back adds the oven's slots to the tasks, not to the
+    # schedules already yielded.
+    schedule, cost, elapsed_time = solutions[-1]
+    assert all(slots == {} for (start, slots) in schedule.values())
+    assert all(oven in task.scheduled_resources for task in tasks)
+    n_threads = threading.active_count()
+    for task in tasks:
+        task.scheduled_start = task.scheduled_resources = None
+    for solution in improving_schedules(tasks, time_limit=2,
+                                        warm_start=True):
+        break
+    assert threading.active_count() == n_threads
@@ -0,0 +1,57 @@
+"""Tests for the instance generator and the scaling benchmark."""
+from taskpacker.benchmarks import (generate_instance, run_scaling_benchmark,
+                                   run_series_benchmark, compare_to_baseline)
+
+
+def test_generate_instance_is_reproducible():
+    parameters = dict(n_units=3, tasks_per_unit=8, max_wait_tightness=0.5,
+                      due_date_pressure=2, seed=4)
+    processes, resources = generate_instance(**parameters)
+    other_processes, other_resources = generate_instance(**parameters)
+    assert [[(t.name, t.duration, t.max_wait, t.due_time) for t in process]
+            for process in processes] == [
+           [(t.name, t.duration, t.max_wait, t.due_time) for t in process]
+           for process in other_processes]
+    assert all(len(task.follows) > 0 for process in processes
+               for task in process[1:])
+    last_tasks = [process[-1] for process in processes]
+    assert last_tasks[0].due_time < last_tasks[-1].due_time
+
+
+def test_run_scaling_benchmark():
+    results = run_scaling_benchmark(
+        sizes=[2, 4], configurations={"greedy": dict(solver_method="greedy")},
+        tasks_per_unit=5)
+    assert [result["n_tasks"] for result in results] == [10, 20]
+    assert all(result["status"] == "greedy" and result["peak_memory"] > 0
+               for result in results)
+
+
+def test_run_scaling_benchmark_records_failures():
+    processes, resources = generate_instance(
+        max_wait_tightness=0.8, precedence_density=0.5, seed=1)
+    assert all(len(task.follows) == 1 for process in processes
+               for task in process if task.max_wait is not None)
+    results = run_scaling_benchmark(
+        sizes=[2], configurations={
+            "greedy": dict(solver_method="greedy"),
+            "wrong": dict(solver_method="greedy", capacity_model="wrong")},
+        max_wait_tightness=0.8, precedence_density=0.5, seed=1)
+    statuses = {result["configuration"]: result["status"]
+                for result in results}
+    assert statuses["greedy"] in ("greedy", "infeasible")
+    assert statuses["wrong"] == "failed"
+
+
+def test_series_benchmark_and_baseline_comparison():
+    processes, resources = generate_instance(n_units=3, tasks_per_unit=4)
+    result = run_series_benchmark(processes, solver_method="greedy",
+                                  est_process_duration="auto")
+    assert len(result["step_times"]) == 3
+    assert result["total_lateness"] == 0
+    baseline = {"bench": dict(result, makespan=result["makespan"] - 1)}
+    regressions = compare_to_baseline({"bench": result}, baseline,
+                                      tolerances=dict(makespan=0))
+    assert len(regressions) == 1
+    assert compare_to_baseline({"bench": result}, baseline,
+                               tolerances=dict(makespan=0.5)) == []
@@ -0,0 +1,58 @@
+"""Tests for the bounds computed from the tasks dependencies."""
+from taskpacker import Task, Resource, numberjack_scheduler
+from taskpacker.bounds import (earliest_starts, latest_starts, lower_bounds,
+                               optimality_gap)
+from taskpacker.benchmarks import generate_instance
+from taskpacker.taskpacker import schedule_cost
+
+
+def test_earliest_and_latest_starts():
+    robot = Resource("robot")
+    task_a = Task("A", resources=[robot], duration=10)
+    task_b = Task("B", resources=[robot], duration=5, follows=[task_a])
+    task_c = Task("C", resources=[robot], duration=7, follows=[task_b],
+                  max_wait=3)
+    task_d = Task("D", resources=[robot], duration=2, scheduled_start=40)
+    tasks = [task_a, task_b, task_c, task_d]
+    heads = earliest_starts(tasks, lower_bound=2)
+    assert [heads[t] for t in tasks] == [2, 12, 17, 40]
+    latest = latest_starts(tasks, horizon=50)
+    assert [latest[t] for t in tasks] == [28, 38, 43, 40]
+
+
+def test_lower_bounds():
+    alice = Resource("Alice", capacity=2)
+    bob = Resource("Bob", capacity=1)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(7)]
+    tasks.append(Task("U", resources=[bob], duration=20, follows=tasks[:1],
+                      due_time=25, priority=2))
+    bounds = lower_bounds(tasks)
+    assert bounds["critical_path"] == 30
+    assert bounds["resource_energy"] == 35
+    assert bounds["makespan"] == 35
+    assert bounds["weighted_lateness"] == 10
+    # Alice's tasks start at best at 0, 0, 10, 10, 20, 20, 30.
+    assert bounds["cost"] == 10 + 90 + 10000
+    assert optimality_gap(bounds["cost"], bounds["cost"]) == 0
+
+
+def test_gap_limit_stops_the_search():
+    processes, resources = generate_instance(
+        n_units=2, tasks_per_unit=3, n_resources=2, durations=(5, 20))
+    tasks = [task for process in processes for task in process]
+    stats = {}
+    scheduled_tasks, report = numberjack_scheduler(
+        tasks, gap_limit=0.5, upper_bound=300, stats=stats,
+        return_report=True)
+    assert report.status == stats["status"] == "stopped"
+    assert 0 < report.gap == stats["gap"] <= 0.5
+    assert report.gap == optimality_gap(schedule_cost(tasks),
+                                        stats["lower_bounds"]["cost"])
+    stopped_cost = report.cost
+    for task in tasks:
+        task.scheduled_start = task.scheduled_resources = None
+    scheduled_tasks, report = numberjack_scheduler(
+        tasks, upper_bound=300, return_report=True)
+    assert report.status == "optimal"
+    assert report.cost < stopped_cost
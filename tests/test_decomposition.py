@@ -0,0 +1,52 @@
+"""Tests for the decomposition of task sets into independent groups."""
+from taskpacker import (Task, Resource, numberjack_scheduler,
+                        validate_schedule)
+from taskpacker.taskpacker import independent_components
+
+
+def test_independent_components():
+    bench_1, bench_2 = Resource("bench_1"), Resource("bench_2")
+    fridge = Resource("fridge", capacity='inf')
+    task_a = Task("A", resources=[bench_1, fridge], duration=10)
+    task_b = Task("B", resources=[bench_1], duration=10)
+    task_c = Task("C", resources=[bench_2, fridge], duration=10)
+    task_d = Task("D", resources=[fridge], duration=10, follows=[task_c])
+    task_e = Task("E", resources=[fridge], duration=10)
+    cleaning = Task("cleaning", resources=[bench_2], duration=10,
+                    scheduled_start=0, scheduled_resources={bench_2: 1})
+    components = independent_components(
+        [task_a, task_b, task_c, task_d, task_e, cleaning])
+    assert components == [[task_a, task_b], [task_c, task_d, cleaning],
+                          [task_e]]
+
+
+def test_decompose_matches_monolithic_model():
+
+    def new_tasks():
+        bench_1 = Resource("bench_1")
+        bench_2 = Resource("bench_2", capacity=2)
+        tasks = []
+        for i in range(3):
+            cut = Task("cut%d" % i, resources=[bench_1], duration=10 + 5 * i)
+            glue = Task("glue%d" % i, resources=[bench_1], duration=10,
+                        follows=[cut], max_wait=20)
+            cook = Task("cook%d" % i, resources=[bench_2], duration=15 + i)
+            serve = Task("serve%d" % i, resources=[bench_2], duration=5,
+                         follows=[cook], due_time=30)
+            tasks += [cut, glue, cook, serve]
+        return tasks
+
+    results = []
+    for parameters in [dict(), dict(decompose=True),
+                       dict(decompose=True, n_jobs=2)]:
+        tasks, stats = new_tasks(), {}
+        numberjack_scheduler(tasks, stats=stats, **parameters)
+        assert validate_schedule(tasks, check_due_times=False) == []
+        results.append((stats["status"], stats["cost"], stats["gap"]))
+        if parameters.get("decompose"):
+            assert stats["n_components"] == 2
+            assert [component_stats["status"]
+                    for component_stats in stats["components"]] == \
+                ["optimal", "optimal"]
+    assert results[1] == results[2] == results[0]
+    assert results[0][0] == "optimal"
@@ -0,0 +1,132 @@
+"""Tests for the solver-free list scheduler."""
+import itertools as itt
+import random
+import time
+
+from taskpacker import (Task, Resource, greedy_scheduler, numberjack_scheduler,
+                        improving_schedules, NoSolutionError)
+
+
+def assert_schedule_is_valid(tasks):
+    for task in tasks:
+        assert task.scheduled_start >= 0
+        for parent in task.follows:
+            assert task.scheduled_start >= parent.scheduled_end
+            if task.max_wait is not None:
+                assert (task.scheduled_start <=
+                        parent.scheduled_end + task.max_wait)
+    for task, other_task in itt.combinations(tasks, 2):
+        for resource in set(task.resources) & set(other_task.resources):
+            if resource.capacity == 'inf':
+                continue
+            if (task.scheduled_resources[resource] ==
+                    other_task.scheduled_resources[resource]):
+                assert ((task.scheduled_end <= other_task.scheduled_start) or
+                        (other_task.scheduled_end <= task.scheduled_start))
+
+
+def test_alice_and_bob_greedy():
+    alice = Resource("Alice", capacity=2)
+    bob = Resource("Bob", capacity=1)
+    clean_scalpels = Task("Clean the scalpels", resources=[bob], duration=20)
+    visit_plants = Task("Visit the plants", resources=[alice], duration=60)
+    cook_hamsters = Task("Cook the hamsters", resources=[alice], duration=30)
+    dice_hamsters = Task("Dice the hamsters", resources=[bob], duration=40,
+                         follows=[cook_hamsters, clean_scalpels], max_wait=5)
+    feed_gremlins = Task("Feed the gremlins", resources=[alice, bob],
+                         duration=50, follows=[dice_hamsters])
+    lunch_break = Task("Lunch break", resources=[bob], duration=30,
+                       scheduled_start=25, scheduled_resources={bob: 1})
+    all_tasks = [clean_scalpels, visit_plants, cook_hamsters, dice_hamsters,
+                 feed_gremlins, lunch_break]
+    scheduled_tasks = numberjack_scheduler(all_tasks, solver_method="greedy")
+    assert lunch_break.scheduled_start == 25
+    assert_schedule_is_valid(scheduled_tasks)
+
+
+def test_greedy_scheduler_scales():
+    rng = random.Random(123)
+    resources = [Resource("r%d" % i, capacity=rng.choice([1, 1, 2, 4]))
+                 for i in range(10)]
+    tasks = []
+    for unit in range(300):
+        unit_tasks = []
+        for i in range(10):
+            follows = [] if i == 0 else [unit_tasks[-1]]
+            unit_tasks.append(Task(
+                "WU%d_%d" % (unit, i),
+                resources=rng.sample(resources, rng.choice([1, 2])),
+                duration=rng.randint(1, 20), follows=follows,
+                max_wait=rng.choice([None, 10])))
+        tasks.extend(unit_tasks)
+    t0 = time.time()
+    greedy_scheduler(tasks)
+    assert time.time() - t0 < 5
+    assert_schedule_is_valid(tasks[:200])
+
+
+def test_improving_schedules_greedy():
+    alice = Resource("Alice", capacity=1)
+    cook = Task("Cook", resources=[alice], duration=30)
+    dice = Task("Dice", resources=[alice], duration=20, follows=[cook])
+    solutions = list(improving_schedules([cook, dice],
+                                         solver_method="greedy"))
+    assert len(solutions) == 1
+    schedule, cost, elapsed_time = solutions[0]
+    assert schedule[dice][0] == dice.scheduled_start == 30
+    assert cost == 30
+
+
+def test_greedy_report_and_error():
+    alice = Resource("Alice", capacity=1)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(3)]
+    scheduled_tasks, report = numberjack_scheduler(
+        tasks, solver_method="greedy", return_report=True)
+    assert (report.status, report.cost) == ("greedy", 30)
+    for task in tasks:
+        task.scheduled_start = task.scheduled_resources = None
+    try:
+        numberjack_scheduler(tasks, solver_method="greedy", upper_bound=20)
+    except NoSolutionError as error:
+        assert isinstance(error, ValueError)
+    else:
+        raise AssertionError("The schedule should not fit before time 20")
+
+
+def test_greedy_max_wait_siblings():
+    machine = Resource("Machine", capacity=1)
+    parent = Task("p", resources=[machine], duration=4)
+    long_child = Task("a", resources=[machine], duration=9, follows=[parent],
+                      max_wait=3)
+    short_child = Task("b", resources=[machine], duration=2, follows=[parent],
+                       max_wait=3)
+    greedy_scheduler([parent, long_child, short_child])
+    assert parent.scheduled_start == 0
+    assert short_child.scheduled_start == 4
+    assert long_child.scheduled_start == 6
+    # Two children of 9 can't both start within 3 of their parent's end.
+    other_child = Task("c", resources=[machine], duration=9,
+                       follows=[parent], max_wait=3)
+    tasks = [parent, long_child, short_child, other_child]
+    for task in tasks:
+        task.scheduled_start = task.scheduled_resources = None
+    try:
+        greedy_scheduler(tasks)
+    except NoSolutionError:
+        pass
+    else:
+        raise AssertionError("The max_wait constraints can't be respected")
+
+
+def test_greedy_keeps_preset_slots():
+    oven = Resource("oven", capacity=2)
+    cleaning = Task("cleaning", resources=[oven], duration=10,
+                    scheduled_start=0, scheduled_resources={oven: 2})
+    bake = Task("bake", resources=[oven], duration=10,
+                scheduled_resources={oven: 2})
+    dry = Task("dry", resources=[oven], duration=10)
+    greedy_scheduler([cleaning, bake, dry])
+    assert (bake.scheduled_start, bake.scheduled_resources) == (10, {oven: 2})
+    assert (dry.scheduled_start, dry.scheduled_resources) == (0, {oven: 1})
+    assert_schedule_is_valid([cleaning, bake, dry])
@@ -0,0 +1,108 @@
+"""Tests for the reading and writing of tasks."""
+import os
+
+import numpy as np
+
+from taskpacker import (Resource, Task, tasks_from_spreadsheet,
+                        save_schedule, load_schedule)
+from taskpacker.io import iter_tasks_from_csv
+from taskpacker.cache import SpreadsheetCache
+
+CSV_DATA = """task;resources;duration;follows;max_wait;color;scheduled_start;\
+scheduled_resources
+cook;Alice;30;;;;0;Alice:2
+dice;Alice, Bob;20;cook;5;red;;
+peel;Bob;10;cook, dice;;;;
+"""
+
+
+def test_tasks_from_csv(tmpdir):
+    csv_path = os.path.join(str(tmpdir), "tasks.csv")
+    with open(csv_path, "w") as f:
+        f.write(CSV_DATA)
+    resources = {"Alice": Resource("Alice", capacity=2),
+                 "Bob": Resource("Bob")}
+    cook, dice, peel = tasks_from_spreadsheet(
+        csv_path, resources_dict=resources, task_name_prefix="WU1_")
+    assert (cook.name, cook.duration, cook.scheduled_start) == \
+        ("WU1_cook", 30, 0)
+    assert cook.scheduled_resources == {resources["Alice"]: 2}
+    assert (cook.follows, cook.max_wait, cook.color) == ((), None, "blue")
+    assert dice.resources == [resources["Alice"], resources["Bob"]]
+    assert (dice.max_wait, dice.color) == (5, "red")
+    assert peel.follows == [cook, dice]
+
+    streamed_tasks = list(iter_tasks_from_csv(csv_path, resources,
+                                              chunksize=2))
+    assert [task.name for task in streamed_tasks] == ["cook", "dice", "peel"]
+    assert streamed_tasks[2].follows == streamed_tasks[:2]
+
+
+def test_spreadsheet_cache(tmpdir):
+    csv_path = os.path.join(str(tmpdir), "tasks.csv")
+    with open(csv_path, "w") as f:
+        f.write(CSV_DATA)
+    resources = {"Alice": Resource("Alice", capacity=2),
+                 "Bob": Resource("Bob")}
+    cache = SpreadsheetCache(os.path.join(str(tmpdir), "cache"))
+    tasks = tasks_from_spreadsheet(csv_path, resources_dict=resources,
+                                   cache=cache)
+    table_path = cache.table_path(csv_path, sep=";")
+    assert os.path.exists(table_path)
+
+    # The second load reads the cached table, not the file.
+    with open(table_path, "rb") as f:
+        cached_table = f.read()
+    os.remove(csv_path)
+    with open(csv_path, "w") as f:
+        f.write(CSV_DATA)
+    cached_tasks = tasks_from_spreadsheet(csv_path, resources_dict=resources,
+                                          cache=cache.directory)
+    assert [t.name for t in cached_tasks] == [t.name for t in tasks]
+    assert cached_tasks[2].follows == cached_tasks[:2]
+
+    # A modified file gets a new table, and old tables are evicted.
+    with open(csv_path, "w") as f:
+        f.write(CSV_DATA.replace("cook", "boil"))
+    cache.max_size = len(cached_table)
+    new_tasks = tasks_from_spreadsheet(csv_path, resources_dict=resources,
+                                       cache=cache)
+    assert new_tasks[0].name == "boil"
+    assert not os.path.exists(table_path)
+    assert os.path.exists(cache.table_path(csv_path, sep=";"))
+
+    # A corrupted table is dropped and the file is parsed again.
+    new_table_path = cache.table_path(csv_path, sep=";")
+    with open(new_table_path, "wb") as f:
+        f.write(b"not a pickle")
+    reparsed_tasks = tasks_from_spreadsheet(csv_path, resources_dict=resources,
+                                            cache=cache)
+    assert [t.name for t in reparsed_tasks] == [t.name for t in new_tasks]
+    with open(new_table_path, "rb") as f:
+        assert f.read() != b"not a pickle"
+    assert [name for name in os.listdir(cache.directory)
+            if name.endswith(".tmp")] == []
+
+
+def test_save_and_load_schedule(tmpdir):
+    alice = Resource("Alice", capacity=2)
+    oven = Resource("oven", full_name="The oven", capacity='inf')
+    cook = Task("cook", [alice, oven], duration=30, scheduled_start=0,
+                scheduled_resources={alice: 2}, color=(0.5, 0.5, 1.0))
+    dice = Task("dice", [alice], duration=20, follows=[cook], max_wait=5.5,
+                scheduled_start=30, scheduled_resources={alice: 1},
+                priority=2, due_time=100)
+    directory = os.path.join(str(tmpdir), "schedule")
+    save_schedule([dice], directory)
+    loaded_dice, = load_schedule(directory)
+    loaded_cook, = loaded_dice.follows
+    for task, loaded_task in [(cook, loaded_cook), (dice, loaded_dice)]:
+        assert loaded_task.to_dict() == task.to_dict()
+        assert loaded_task.scheduled_resources == task.scheduled_resources
+        assert loaded_task.color == task.color
+    assert loaded_cook.resources[1].full_name == "The oven"
+    assert loaded_cook.resources[1].capacity == 'inf'
+
+    table = load_schedule(directory, as_table=True)
+    assert list(table.starts) == [30, 0]
+    assert isinstance(table.starts, np.memmap)
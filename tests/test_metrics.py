@@ -0,0 +1,25 @@
+"""Tests for the schedule metrics."""
+from taskpacker import Task, Resource, schedule_metrics
+
+
+def test_schedule_metrics():
+    alice, bob = Resource("Alice", capacity=2), Resource("Bob")
+    cook = Task("cook", resources=[alice], duration=10, scheduled_start=0,
+                scheduled_resources={alice: 1})
+    dice = Task("dice", resources=[alice, bob], duration=10,
+                scheduled_start=15, scheduled_resources={alice: 1, bob: 1},
+                follows=[cook], due_time=20, priority=2)
+    peel = Task("peel", resources=[alice], duration=5, scheduled_start=35,
+                scheduled_resources={alice: 2}, follows=[dice])
+    metrics = schedule_metrics([cook, dice, peel])
+    assert (metrics["start"], metrics["makespan"]) == (0, 40)
+    assert metrics["total_weighted_lateness"] == 10
+    assert list(metrics["lateness"]) == [0, 5, 0]
+    resources = metrics["resources"]
+    assert resources.loc["Alice", "busy_time"] == 25
+    assert resources.loc["Bob", "utilization"] == 0.25
+    slots = metrics["slots"].set_index(["resource", "slot"])
+    assert slots.loc[("Alice", 1), "idle_time"] == 5
+    assert slots.loc[("Alice", 2), "n_tasks"] == 1
+    assert list(metrics["waits"]["wait"]) == [5, 10]
+    assert list(metrics["idle_gaps"]["duration"]) == [5]
@@ -0,0 +1,73 @@
+"""Tests for the parallel scheduling methods."""
+from taskpacker import (Task, Resource, portfolio_scheduler,
+                        schedule_processes_series)
+
+
+def test_portfolio_scheduler():
+    alice = Resource("Alice", capacity=2)
+    bob = Resource("Bob", capacity=1)
+    cook_hamsters = Task("Cook the hamsters", resources=[alice], duration=30)
+    dice_hamsters = Task("Dice the hamsters", resources=[bob], duration=40,
+                         follows=[cook_hamsters])
+    feed_gremlins = Task("Feed the gremlins", resources=[alice, bob],
+                         duration=50, follows=[dice_hamsters])
+    tasks = [cook_hamsters, dice_hamsters, feed_gremlins]
+    stats = {}
+    scheduled_tasks = portfolio_scheduler(
+        tasks, time_limit=2, stats=stats,
+        configurations=[dict(solver_method="greedy"),
+                        dict(solver_method="greedy", warm_start=True)])
+    assert set(scheduled_tasks) == set(tasks)
+    assert feed_gremlins.scheduled_start == 70
+    assert feed_gremlins.scheduled_resources == {alice: 1, bob: 1}
+    assert stats["costs"][0] == 100
+    assert stats["errors"] == [None, None]
+
+
+def test_portfolio_scheduler_reports_errors():
+    alice = Resource("Alice", capacity=1)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(3)]
+    stats = {}
+    portfolio_scheduler(
+        tasks, time_limit=2, stats=stats,
+        configurations=[dict(solver_method="greedy", capacity_model="wrong"),
+                        dict(solver_method="greedy")])
+    assert stats["costs"][1] == 30
+    assert stats["errors"][0].startswith("ValueError")
+    assert max(task.scheduled_end for task in tasks) == 30
+
+
+def test_portfolio_configuration_with_its_own_time_limit():
+    alice = Resource("Alice", capacity=1)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(3)]
+    stats = {}
+    portfolio_scheduler(
+        tasks, time_limit=2, stats=stats,
+        configurations=[dict(solver_method="Mistral", time_limit=1),
+                        dict(solver_method="greedy")])
+    assert stats["errors"] == [None, None]
+    assert stats["costs"] == [30, 30]
+
+
+def test_schedule_processes_series_with_parallel_trials():
+    robot = Resource("robot", capacity=1)
+    oven = Resource("oven", capacity=2)
+
+    def new_process(i):
+        load = Task("WU%d_load" % i, resources=[robot], duration=5)
+        bake = Task("WU%d_bake" % i, resources=[oven], duration=30,
+                    follows=[load], max_wait=2)
+        unload = Task("WU%d_unload" % i, resources=[robot], duration=5,
+                      follows=[bake], max_wait=2)
+        return [load, bake, unload]
+
+    processes = [new_process(i) for i in range(4)]
+    new_processes = schedule_processes_series(
+        processes, est_process_duration=500, time_limit=2,
+        solver_method="greedy", parallel_trials=True)
+    for process in new_processes:
+        load, bake, unload = process
+        assert bake.scheduled_start <= load.scheduled_end + 2
+        assert unload.scheduled_start <= bake.scheduled_end + 2
@@ -0,0 +1,49 @@
+"""Tests for the profiling observers."""
+import tracemalloc
+
+from taskpacker import (Task, Resource, numberjack_scheduler, PhaseTimer,
+                        MemoryPeakObserver)
+from taskpacker.profiling import ObserverGroup
+
+
+def test_phase_observers():
+    alice = Resource("Alice", capacity=2)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(20)]
+    timer, memory = PhaseTimer(), MemoryPeakObserver()
+    numberjack_scheduler(tasks, solver_method="greedy", upper_bound="auto",
+                         observer=ObserverGroup([timer, memory]))
+    tracemalloc.stop()
+    assert sorted(timer.counts.items()) == [("filtering", 1), ("horizon", 1)]
+    assert memory.peaks["horizon"] > 0
+    assert "horizon" in timer.summary()
+
+
+def test_phases_end_on_errors():
+    alice = Resource("Alice", capacity=1)
+    tasks = [Task("T%d" % i, resources=[alice], duration=10)
+             for i in range(3)]
+    timer = PhaseTimer()
+
+    def on_solution(schedule, cost, elapsed_time):
+        raise RuntimeError("Interrupted")
+
+    try:
+        numberjack_scheduler(tasks, on_solution=on_solution, observer=timer)
+    except RuntimeError:
+        pass
+    assert timer.counts["solve"] == 1
+    assert all(starts == [] for starts in timer._start_times.values())
+
+
+def test_memory_peaks_without_reset_peak(monkeypatch):
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    memory = MemoryPeakObserver()
+    memory.phase_started("outer")
+    memory.phase_started("inner")
+    data = [list(range(1000)) for i in range(10)]
+    memory.phase_ended("inner")
+    memory.phase_ended("outer")
+    tracemalloc.stop()
+    assert memory.peaks["outer"] >= memory.peaks["inner"] > 0
+    assert len(data) == 10
@@ -0,0 +1,29 @@
+"""Tests for the detection of interchangeable processes."""
+from taskpacker import Task, Resource
+from taskpacker.symmetries import identical_processes
+
+
+def make_process(name, resources, lunch_break, due_time=None):
+    cook = Task(name + "cook", resources=resources[:1], duration=30,
+                follows=[lunch_break])
+    dice = Task(name + "dice", resources=resources, duration=20,
+                follows=[cook], max_wait=5, due_time=due_time)
+    return [cook, dice]
+
+
+def test_identical_processes():
+    alice, bob = Resource("Alice", capacity=2), Resource("Bob")
+    lunch_break = Task("Lunch break", resources=[bob], duration=30,
+                       scheduled_start=0, scheduled_resources={bob: 1})
+    processes = [make_process("WU%d_" % i, [alice, bob], lunch_break)
+                 for i in range(3)]
+    processes.append(make_process("WU3_", [alice, bob], lunch_break,
+                                  due_time=100))
+    processes.append(make_process("WU4_", [bob, alice], lunch_break))
+    tasks = [lunch_break] + [task for process in processes
+                             for task in process]
+    assert identical_processes(tasks) == [processes[:3]]
+    windows = {processes[0][0]: (0, 10)}
+    assert identical_processes(tasks, windows) == [processes[1:3]]
+    processes[0][0].scheduled_resources = {alice: 2}
+    assert identical_processes(tasks) == [processes[1:3]]
@@ -0,0 +1,45 @@
+"""Tests for the columnar representation of tasks."""
+import numpy as np
+
+from taskpacker import Task, Resource
+from taskpacker.tasktable import TaskTable
+
+
+def test_task_table_round_trip():
+    alice, bob = Resource("Alice", capacity=2), Resource("Bob")
+    cook = Task("Cook", resources=[alice], duration=30, scheduled_start=10,
+                scheduled_resources={alice: 2})
+    dice = Task("Dice", resources=[bob, alice], duration=20,
+                follows=[cook], max_wait=5, due_time=100, priority=2)
+    table = TaskTable.from_tasks([cook, dice])
+    assert list(table.ends[:1]) == [40] and np.isnan(table.ends[1])
+    assert list(table.parents(1)) == [0]
+    tasks_indices, slots = table.resource_tasks(table.resources.index(alice))
+    assert list(tasks_indices) == [0, 1] and list(slots) == [2, 0]
+    assert table.incidence_matrix().sum() == 3
+
+    new_cook, new_dice = table.to_tasks()
+    for task, new_task in [(cook, new_cook), (dice, new_dice)]:
+        for attribute in ("name", "resources", "duration", "scheduled_start",
+                          "scheduled_resources", "max_wait", "due_time",
+                          "priority", "color"):
+            assert getattr(task, attribute) == getattr(new_task, attribute)
+    assert new_dice.follows == [new_cook]
+    assert isinstance(new_cook.scheduled_start, int)
+
+
+def test_integer_times_per_column():
+    alice = Resource("Alice", capacity=1)
+    cook = Task("Cook", resources=[alice], duration=30, scheduled_start=2.5,
+                scheduled_resources={alice: 1})
+    dice = Task("Dice", resources=[alice], duration=20, follows=[cook],
+                max_wait=0.5)
+    table = TaskTable.from_tasks([cook, dice])
+    assert table.integer_times == dict(durations=True, starts=False,
+                                       due_times=True, max_waits=False)
+    new_cook, new_dice = table.to_tasks()
+    assert isinstance(new_cook.duration, int)
+    assert (new_cook.scheduled_start, new_dice.max_wait) == (2.5, 0.5)
+    # A single boolean is also accepted, and applies to all the columns.
+    float_table = TaskTable(**dict(vars(table), integer_times=False))
+    assert isinstance(float_table.to_tasks()[0].duration, float)
@@ -0,0 +1,26 @@
+"""Tests for the process templates."""
+import time
+
+from taskpacker import Task, Resource, ProcessTemplate
+
+
+def test_process_template():
+    alice = Resource("Alice", capacity=2)
+    lunch_break = Task("Lunch break", resources=[alice], duration=30,
+                       scheduled_start=0, scheduled_resources={alice: 1})
+    cook = Task("cook", resources=[alice], duration=10, color=None,
+                follows=[lunch_break])
+    dice = Task("dice", resources=[alice], duration=5, follows=[cook],
+                max_wait=2, color="red")
+    template = ProcessTemplate([cook, dice])
+    t0 = time.time()
+    processes = template.instantiate_many(500, tasks_colors=["green"] * 500)
+    assert time.time() - t0 < 1
+    new_cook, new_dice = processes[1]
+    assert (new_cook.name, new_dice.name) == ("WU2_cook", "WU2_dice")
+    assert (new_cook.color, new_dice.color) == ("green", "red")
+    assert new_dice.follows == [new_cook]
+    assert new_cook.follows == [lunch_break]
+    assert new_cook.resources[0] is alice
+    assert len(set(task.id for process in processes for task in process)) \
+        == 1000
@@ -0,0 +1,48 @@
+"""Tests for the rescaling of time in scheduling problems."""
+from taskpacker import Task, Resource, numberjack_scheduler
+from taskpacker.timescale import time_granularity, scale_tasks
+
+
+def test_time_granularity_and_scale_tasks():
+    alice = Resource("Alice", capacity=1)
+    lunch_break = Task("Lunch break", resources=[alice], duration=30,
+                       scheduled_start=45, scheduled_resources={alice: 1})
+    cook = Task("Cook", resources=[alice], duration=60)
+    dice = Task("Dice", resources=[alice], duration=15, follows=[cook],
+                max_wait=30, due_time=120)
+    assert time_granularity([dice]) == 15
+    assert time_granularity([lunch_break, cook, dice]) == 15
+    assert time_granularity([Task("T", resources=[], duration=2.5)]) == 1
+    assert time_granularity([dice], [None, 500]) == 5
+    assert time_granularity([dice], [10]) == 5
+
+    (scaled_dice,), copies = scale_tasks([dice], 15)
+    assert (scaled_dice.duration, scaled_dice.max_wait) == (1, 2)
+    assert scaled_dice.due_time == 8
+    assert scaled_dice.follows == [copies[cook]]
+    assert copies[cook].duration == 4
+    assert cook.duration == 60
+
+    # Coarse rescaling: the fixed task still covers its original interval.
+    (scaled_break,), _ = scale_tasks([lunch_break], 20, exact=False)
+    assert (scaled_break.scheduled_start, scaled_break.duration) == (2, 2)
+
+
+def test_time_step_includes_the_bounds():
+    alice = Resource("Alice", capacity=1)
+    cook = Task("Cook", resources=[alice], duration=60)
+    dice = Task("Dice", resources=[alice], duration=15, follows=[cook])
+    stats = {}
+    numberjack_scheduler([cook, dice], lower_bound=10, upper_bound=505,
+                         stats=stats)
+    assert stats["time_step"] == 5
+    assert (cook.scheduled_start, dice.scheduled_start) == (10, 70)
+
+    # The lower bounds are those of the problem, not of the schedule found.
+    peel = Task("Peel", resources=[alice], duration=30)
+    for task in (cook, dice):
+        task.scheduled_start = task.scheduled_resources = None
+    numberjack_scheduler([cook, dice, peel], lower_bound=10,
+                         upper_bound=505, stats=stats)
+    assert (stats["cost"], stats["lower_bounds"]["cost"]) == (150, 90)
+    assert stats["gap"] == 0.4
@@ -0,0 +1,64 @@
+"""Tests for the schedule validator."""
+import time
+
+import numpy as np
+
+from taskpacker import Task, Resource, validate_schedule, Violation
+from taskpacker.tasktable import TaskTable
+
+
+def test_validate_schedule():
+    alice, bob = Resource("Alice", capacity=2), Resource("Bob")
+    oven = Resource("Oven", capacity='inf')
+
+    def task(name, resources, start, slots, **kwargs):
+        return Task(name, resources=resources, duration=10,
+                    scheduled_start=start, scheduled_resources=slots,
+                    **kwargs)
+
+    cook = task("cook", [alice, oven], 0, {alice: 1, oven: 1})
+    long_task = task("long", [bob], 0, {bob: 1})
+    long_task.duration = 100
+    clean = task("clean", [bob], 50, {bob: 1})
+    dice = task("dice", [alice], 5, {alice: 2}, follows=[cook], max_wait=2,
+                due_time=12)
+    peel = task("peel", [alice], 8, {alice: 1})
+    assert validate_schedule([cook, long_task]) == []
+
+    violations = validate_schedule([long_task, clean, dice, peel])
+    assert all(isinstance(violation, Violation) for violation in violations)
+    kinds = sorted(violation.kind for violation in violations)
+    assert kinds == ["capacity", "capacity", "due_time", "precedence",
+                     "slot_overlap", "slot_overlap"]
+    overlaps = sorted(violation.tasks for violation in violations
+                      if violation.kind == "slot_overlap")
+    assert overlaps == [("cook", "peel"), ("long", "clean")]
+
+    dice.scheduled_start = 30
+    kinds = [violation.kind for violation in validate_schedule([dice])]
+    assert sorted(kinds) == ["due_time", "max_wait"]
+
+
+def test_validate_large_schedule():
+    n_tasks = 100000
+    resources = [Resource("R%d" % i, capacity=2) for i in range(100)]
+    resource_indices = np.arange(n_tasks) % 100
+    starts = 10.0 * (np.arange(n_tasks) // 200)
+    slots = 1 + (np.arange(n_tasks) // 100) % 2
+    table = TaskTable(
+        names=np.array(["T%d" % i for i in range(n_tasks)], dtype=object),
+        durations=np.full(n_tasks, 10.0), starts=starts,
+        due_times=np.full(n_tasks, np.nan),
+        max_waits=np.full(n_tasks, np.nan), priorities=np.ones(n_tasks),
+        colors=np.full(n_tasks, "blue", dtype=object), resources=resources,
+        resource_indptr=np.arange(n_tasks + 1),
+        resource_indices=resource_indices, slots=slots,
+        has_slots=np.ones(n_tasks, dtype=bool),
+        # Each task follows the task using the same slot just before it.
+        follows_indptr=np.r_[0, np.cumsum(np.arange(n_tasks) >= 200)],
+        follows_indices=np.arange(n_tasks - 200)
+    )
+    t0 = time.time()
+    violations = validate_schedule(table)
+    assert time.time() - t0 < 2
+    assert violations == []
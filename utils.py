@@ -2,35 +2,34 @@
 Code that is only really useful for the examples.
 """
 
-import itt
-from .classes import Task, WorkUnit, Resource
+import itertools as itt
+from taskpacker import Task, Resource
 
 
 foundry = Resource("foundry")
 
 
 def make_jobs_tree(levels=3, level_width=10, order_due_time=100):
+    """Return a tree of assembly jobs, as a list of levels of tasks.
+
+    The first level holds the ordered job, due at ``order_due_time``. Each
+    job of a level follows ``level_width`` jobs of the next level, so the
+    jobs of level n are n steps away from the order.
+    """
 
     def generator():
         counter = itt.count()
         for i in counter:
-            yield WorkUnit(name="asm(%d)" % (i),
-                           tasks=[Task("asm", foundry, 4)])
+            yield Task("asm(%d)" % (i), resources=[foundry], duration=4)
     job_generator = generator()
-    order_job = job_generator.next()
-    order_job.steps_to_order = 0
+    order_job = next(job_generator)
     order_job.due_time = order_due_time
-    order_job.order_due_time = order_due_time
     jobs_levels = [[order_job]]
 
     for level in range(levels):
         jobs_levels.append([])
         for child in jobs_levels[level]:
-            new_jobs = [job_generator.next() for i in range(level_width)]
-            for job in new_jobs:
-                job.steps_to_order = level+1
-                job.order_due_time = order_due_time
-
-            child.parents = new_jobs
+            new_jobs = [next(job_generator) for i in range(level_width)]
+            child.follows = new_jobs
             jobs_levels[level+1].extend(new_jobs)
     return jobs_levels